@@ -15,6 +15,45 @@ from db_schema import CREATE_TABLES_SQL
 
 logger = logging.getLogger(__name__)
 
+# WAL with synchronous=NORMAL avoids an fsync per commit while staying
+# safe against application and OS crashes
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+)
+
+def configure_connection(conn: sqlite3.Connection) -> None:
+    """Apply the write-throughput PRAGMAs to a freshly opened connection."""
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+
+INSERT_TRADE_SQL = """
+    INSERT INTO trades (
+        trade_id, pool_id, trade_type, tx_signature,
+        base_amount, quote_amount, price, timestamp, status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_POSITION_SQL = """
+    INSERT INTO positions (
+        pool_id, entry_trade_id, entry_price, entry_timestamp, status
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+
+UPDATE_POSITION_SQL = """
+    UPDATE positions 
+    SET exit_trade_id = ?,
+        exit_price = ?,
+        exit_timestamp = ?,
+        pnl = ?,
+        status = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE pool_id = ? AND status = 'open'
+"""
+
 class DecimalEncoder(json.JSONEncoder):
     """Custom JSON encoder for Decimal types."""
     def default(self, obj):
@@ -23,11 +62,16 @@ class DecimalEncoder(json.JSONEncoder):
         return super().default(obj)
 
 class DatabaseManager:
-    def __init__(self, db_path: str):
-        """Initialize database connection and create tables if they don't exist."""
+    def __init__(self, db_path: str, check_same_thread: bool = True):
+        """Initialize database connection and create tables if they don't exist.
+
+        Pass check_same_thread=False when all calls are funnelled through a
+        single worker thread other than the one that opened the connection.
+        """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
+        self.conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
         self.conn.row_factory = sqlite3.Row  # Enable row factory for named access
+        configure_connection(self.conn)
         self.setup_database()
 
     def setup_database(self):
@@ -52,10 +96,10 @@ class DatabaseManager:
                 return int(dt.timestamp() * 1000)
             except ValueError:
                 logger.error(f"Invalid timestamp format: {timestamp}")
-                return int(time.time() * 1000)
+                return time.time_ns() // 1_000_000
         else:
             logger.error(f"Unexpected timestamp type: {type(timestamp)}")
-            return int(time.time() * 1000)
+            return time.time_ns() // 1_000_000
 
     def store_pool(self, pool_data: Dict[str, Any]) -> bool:
         """Store a new pool in the database."""
@@ -230,8 +274,9 @@ class DatabaseManager:
             return []
 
     def close(self):
-        """Close the database connection."""
+        """Checkpoint the WAL and close the database connection."""
         if self.conn:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             self.conn.close()
 
     def __enter__(self):
@@ -242,28 +287,46 @@ class DatabaseManager:
         """Context manager exit."""
         self.close()
 
+    def _trade_row(self, trade_data: Dict[str, Any]) -> tuple:
+        """Build the INSERT_TRADE_SQL parameters for a trade."""
+        return (
+            trade_data['tx_signature'],  # Use tx signature as trade ID
+            trade_data['pool_id'],
+            trade_data.get('trade_type', 'buy'),
+            trade_data['tx_signature'],
+            float(trade_data['base_amount']),
+            float(trade_data['quote_amount']),
+            float(trade_data['price']),
+            self._convert_timestamp(trade_data.get('timestamp', time.time())),
+            trade_data.get('status', 'confirmed')
+        )
+
+    def _position_row(self, position_data: Dict[str, Any]) -> tuple:
+        """Build the INSERT_POSITION_SQL parameters for a new position."""
+        return (
+            position_data['pool_id'],
+            position_data['entry_trade_id'],
+            float(position_data['entry_price']),
+            self._convert_timestamp(position_data['opened_at']),
+            position_data.get('status', 'open')
+        )
+
+    def _position_exit_row(self, position_data: Dict[str, Any]) -> tuple:
+        """Build the UPDATE_POSITION_SQL parameters for a position exit."""
+        return (
+            position_data.get('exit_trade_id'),
+            float(position_data.get('exit_price', 0.0)),
+            self._convert_timestamp(position_data.get('closed_at', datetime.now())),
+            float(position_data.get('pnl', 0.0)),
+            position_data.get('status', 'closed'),
+            position_data['pool_id']
+        )
+
     def store_trade(self, trade_data: Dict[str, Any]) -> bool:
         """Store a trade in the database."""
         try:
-            timestamp = self._convert_timestamp(trade_data.get('timestamp', time.time()))
-            
             with self.conn:
-                self.conn.execute("""
-                    INSERT INTO trades (
-                        trade_id, pool_id, trade_type, tx_signature,
-                        base_amount, quote_amount, price, timestamp, status
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    trade_data['tx_signature'],  # Use tx signature as trade ID
-                    trade_data['pool_id'],
-                    trade_data.get('trade_type', 'buy'),
-                    trade_data['tx_signature'],
-                    float(trade_data['base_amount']),
-                    float(trade_data['quote_amount']),
-                    float(trade_data['price']),
-                    timestamp,
-                    trade_data.get('status', 'confirmed')
-                ))
+                self.conn.execute(INSERT_TRADE_SQL, self._trade_row(trade_data))
             return True
         except Exception as e:
             logger.error(f"Error storing trade: {str(e)}")
@@ -273,20 +336,7 @@ class DatabaseManager:
         """Store a trading position in the database."""
         try:
             with self.conn:
-                self.conn.execute("""
-                    INSERT INTO positions (
-                        pool_id, entry_trade_id, entry_price,
-                        base_amount, quote_amount, status, opened_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    position_data['pool_id'],
-                    position_data['entry_trade_id'],
-                    float(position_data['entry_price']),
-                    float(position_data['base_amount']),
-                    float(position_data['quote_amount']),
-                    position_data.get('status', 'open'),
-                    position_data['opened_at']
-                ))
+                self.conn.execute(INSERT_POSITION_SQL, self._position_row(position_data))
             return True
         except Exception as e:
             logger.error(f"Error storing position: {str(e)}")
@@ -296,30 +346,28 @@ class DatabaseManager:
         """Update an existing position with exit information."""
         try:
             with self.conn:
-                self.conn.execute("""
-                    UPDATE positions 
-                    SET exit_trade_id = ?,
-                        exit_price = ?,
-                        pnl = ?,
-                        pnl_percentage = ?,
-                        status = ?,
-                        closed_at = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE pool_id = ? AND status = 'open'
-                """, (
-                    position_data.get('exit_trade_id'),
-                    float(position_data.get('exit_price', 0.0)),
-                    float(position_data.get('pnl', 0.0)),
-                    float(position_data.get('pnl_percentage', 0.0)),
-                    position_data.get('status', 'closed'),
-                    position_data.get('closed_at', datetime.now().isoformat()),
-                    position_data['pool_id']
-                ))
+                self.conn.execute(UPDATE_POSITION_SQL, self._position_exit_row(position_data))
             return True
         except Exception as e:
             logger.error(f"Error updating position: {str(e)}")
             return False
 
+    def store_trade_batch(self, trades: List[Dict[str, Any]], positions: List[Dict[str, Any]],
+                          position_exits: List[Dict[str, Any]]) -> bool:
+        """Store trades, new positions and position exits in a single transaction."""
+        try:
+            with self.conn:
+                if trades:
+                    self.conn.executemany(INSERT_TRADE_SQL, [self._trade_row(t) for t in trades])
+                if positions:
+                    self.conn.executemany(INSERT_POSITION_SQL, [self._position_row(p) for p in positions])
+                if position_exits:
+                    self.conn.executemany(UPDATE_POSITION_SQL, [self._position_exit_row(p) for p in position_exits])
+            return True
+        except Exception as e:
+            logger.error(f"Error storing trade batch: {str(e)}")
+            return False
+
     def save_portfolio_state(self, portfolio_data: Dict[str, Any], file_path: str) -> bool:
         """Save portfolio state to a JSON file with proper Decimal handling."""
         try:
@@ -117,7 +117,10 @@ CREATE INDEX IF NOT EXISTS idx_pools_discovery ON pools(discovery_timestamp);
 CREATE INDEX IF NOT EXISTS idx_trades_pool_timestamp ON trades(pool_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_trades_status ON trades(status);
 CREATE INDEX IF NOT EXISTS idx_positions_status ON positions(status);
-CREATE INDEX IF NOT EXISTS idx_positions_pool ON positions(pool_id);
+-- Serves the open-position lookup in DatabaseManager.update_position
+-- (WHERE pool_id = ? AND status = 'open'); supersedes the pool_id-only index
+DROP INDEX IF EXISTS idx_positions_pool;
+CREATE INDEX IF NOT EXISTS idx_positions_pool_status ON positions(pool_id, status);
 CREATE INDEX IF NOT EXISTS idx_snapshots_pool_timestamp ON pool_snapshots(pool_id, timestamp);
 CREATE INDEX IF NOT EXISTS idx_snapshots_timestamp ON pool_snapshots(timestamp);
 CREATE INDEX IF NOT EXISTS idx_exit_strategies_pool ON exit_strategies(pool_id);
@@ -11,6 +11,7 @@ import os
 import json
 import sys
 from datetime import datetime
+from time import time_ns
 from typing import Dict, Any, Optional, List, Set, Deque
 from collections import deque
 from dataclasses import dataclass
@@ -26,6 +27,9 @@ from paper_trading import PaperTradingManager
 # Load environment variables
 load_dotenv()
 
+# Per-packet Socket.IO / Engine.IO logging, only when debugging the connection
+SIO_DEBUG = os.getenv('SIO_DEBUG') == '1'
+
 # Configure logging
 logging.config.dictConfig({
     'version': 1,
@@ -64,10 +68,19 @@ logging.config.dictConfig({
             'handlers': ['default', 'file'],
             'level': 'INFO',
             'propagate': True
+        },
+        'engineio.client': {
+            'level': 'DEBUG' if SIO_DEBUG else 'WARNING'
+        },
+        'socketio.client': {
+            'level': 'DEBUG' if SIO_DEBUG else 'WARNING'
         }
     }
 })
 
+# Trade/position rows written per transaction by the DB writer task
+DB_WRITE_BATCH_SIZE = 32
+
 # Initialize loggers
 logger = logging.getLogger(__name__)  # Main logger for general logging
 pool_logger = logging.getLogger('pool_events')  # Logger for pool-related events
@@ -98,7 +111,7 @@ def log_trade_event(message: str, level: str = 'info'):
     elif level == 'error':
         trade_logger.error(formatted_message)
 
-@dataclass
+@dataclass(slots=True)
 class TradeConfig:
     """Configuration for trading parameters."""
     initial_buy_amount: float = float(os.getenv('INITIAL_BUY', '0.005'))
@@ -123,6 +136,17 @@ class TradeConfig:
     enable_timing_logs: bool = os.getenv('ENABLE_TIMING_LOGS', '1') == '1'  # Enable detailed timing logs
     max_monitor_time: int = int(os.getenv('MAX_MONITOR_TIME', '300'))  # Maximum monitoring time in seconds
 
+@dataclass(slots=True)
+class PoolMonitorState:
+    """Per-pool state for an actively monitored position."""
+    initial_price: float
+    target_price: float  # absolute price that triggers the profit exit
+    stop_price: float  # absolute price that triggers the stop loss
+    start_time: datetime
+    last_update: datetime
+    status: str = 'monitoring'
+    task: Optional[asyncio.Task] = None
+
 class RaydiumWebSocketClient:
     """Main WebSocket client for Raydium pool monitoring and trading with immediate execution."""
     
@@ -133,7 +157,7 @@ class RaydiumWebSocketClient:
         self.ws = None
         self._trade_queue = asyncio.Queue()
         self._pending_pools = {}  # Track pools waiting for valid price
-        self._active_monitors = {}  # Track actively monitored pools
+        self._active_monitors: Dict[str, PoolMonitorState] = {}  # Track actively monitored pools
         self._traded_pools = set()  # Track pools that have been traded
         self._monitor_tasks = {}  # Track monitoring tasks
         self._pool_locks = {}  # Track locks for pool operations
@@ -143,7 +167,7 @@ class RaydiumWebSocketClient:
             'total_latency': []
         }
         self._trade_timings = {}
-        self.paper_trader = PaperTradingManager() if not config.live_trading else None
+        self.paper_trader = None  # created by _initialize_trading
         self._stop_event = asyncio.Event()
         self._max_concurrent_monitors = 50  # Maximum number of pools to monitor simultaneously
         self._monitor_semaphore = asyncio.Semaphore(self._max_concurrent_monitors)  # Limit concurrent monitors
@@ -155,7 +179,12 @@ class RaydiumWebSocketClient:
         self._pool_processing_tasks: Dict[str, asyncio.Task] = {}
         self._rpc_connection_pool = []
         self._thread_pool = ThreadPoolExecutor(max_workers=config.max_parallel_pools)
+        # All SQLite calls run on this one worker so commits never block the event loop
+        self._db_executor = ThreadPoolExecutor(max_workers=1)
         self._trade_processor_task = None
+        # Trade/position writes queued by _record_trade for the _db_writer task
+        self._db_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
+        self._db_writer_task = None
         self._recent_pools: Deque[Dict[str, Any]] = deque(maxlen=100)  # Track recent pools for latency analysis
         self._latency_stats: Dict[str, List[float]] = {
             'detection_to_ready': [],
@@ -185,8 +214,8 @@ class RaydiumWebSocketClient:
         """Initialize Socket.IO client with proper error handling."""
         try:
             self.sio = socketio.AsyncClient(
-                logger=True,
-                engineio_logger=True,
+                logger=SIO_DEBUG,
+                engineio_logger=SIO_DEBUG,
                 reconnection=True,
                 reconnection_attempts=self.config.max_reconnection_attempts,
                 reconnection_delay=self.config.reconnection_delay,
@@ -201,7 +230,7 @@ class RaydiumWebSocketClient:
     def _initialize_database(self):
         """Initialize database manager."""
         try:
-            self.db_manager = DatabaseManager('trading_history.sqlite')
+            self.db_manager = DatabaseManager('trading_history.sqlite', check_same_thread=False)
         except Exception as e:
             logger.error(f"Failed to initialize database: {str(e)}")
             raise
@@ -402,28 +431,30 @@ Event Data: {data}
 """
             log_pool_event(error_message, level='error')
     
+    async def _run_db(self, func, *args):
+        """Run a blocking DatabaseManager call on the DB worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._db_executor, func, *args)
+    
     async def _store_pool_async(self, pool_data: Dict[str, Any]):
         """Store pool data in database asynchronously."""
         try:
-            if not self.db_manager.store_pool(pool_data):
+            if not await self._run_db(self.db_manager.store_pool, pool_data):
                 logger.error(f"Failed to store pool {pool_data['pool_id']} in database")
         except Exception as e:
             logger.error(f"Error storing pool data: {str(e)}")
     
     async def _record_trade(self, pool_id: str, trade_result: Dict[str, Any], trade_type: str):
-        """Record trade details in the database asynchronously."""
+        """Queue trade details for the database writer task."""
         try:
             # Store trade record
-            if not self.db_manager.store_trade({
+            await self._db_queue.put(('trade', {
                 **trade_result,
                 'trade_type': trade_type
-            }):
-                logger.error(f"Failed to store {trade_type} trade for pool {pool_id}")
-                return
+            }))
             
             # For buys, create or update position
             if trade_type == 'buy':
-                position_data = {
+                await self._db_queue.put(('position', {
                     'pool_id': pool_id,
                     'entry_trade_id': trade_result['tx_signature'],
                     'entry_price': trade_result['price'],
@@ -431,14 +462,11 @@ Event Data: {data}
                     'quote_amount': trade_result['quote_amount'],
                     'status': 'open',
                     'opened_at': datetime.fromtimestamp(trade_result['timestamp'] / 1000).isoformat()
-                }
-                if not self.db_manager.store_position(position_data):
-                    logger.error(f"Failed to store position for pool {pool_id}")
-                    return
+                }))
             
             # For sells, update position status
             if trade_type == 'sell':
-                position_data = {
+                await self._db_queue.put(('position_exit', {
                     'pool_id': pool_id,
                     'exit_trade_id': trade_result['tx_signature'],
                     'exit_price': trade_result['price'],
@@ -446,16 +474,35 @@ Event Data: {data}
                     'pnl_percentage': trade_result.get('pnl_percentage', 0.0),
                     'status': 'closed',
                     'closed_at': datetime.fromtimestamp(trade_result['timestamp'] / 1000).isoformat()
-                }
-                if not self.db_manager.update_position(position_data):
-                    logger.error(f"Failed to update position for pool {pool_id}")
-                    return
-            
-            logger.info(f"✅ Successfully recorded {trade_type} trade for pool {pool_id}")
+                }))
             
         except Exception as e:
             logger.error(f"Error recording {trade_type} trade: {str(e)}")
     
+    def _write_db_batch(self, pending: List[tuple]) -> None:
+        """Write queued trades, new positions and position exits in one transaction."""
+        trades = [row for kind, row in pending if kind == 'trade']
+        positions = [row for kind, row in pending if kind == 'position']
+        position_exits = [row for kind, row in pending if kind == 'position_exit']
+        if self.db_manager.store_trade_batch(trades, positions, position_exits):
+            logger.info(f"✅ Successfully recorded {len(trades)} trade(s), {len(positions)} new position(s), {len(position_exits)} closed position(s)")
+        else:
+            logger.error(f"Failed to store {len(pending)} queued trade/position writes")
+    
+    async def _db_writer(self):
+        """Drain the DB queue, writing up to DB_WRITE_BATCH_SIZE rows per transaction."""
+        while True:
+            pending = [await self._db_queue.get()]
+            while len(pending) < DB_WRITE_BATCH_SIZE and not self._db_queue.empty():
+                pending.append(self._db_queue.get_nowait())
+            try:
+                await self._run_db(self._write_db_batch, pending)
+            except Exception as e:
+                logger.error(f"Error writing trade batch: {str(e)}")
+            finally:
+                for _ in pending:
+                    self._db_queue.task_done()
+    
     async def _on_health(self, data):
         """Handle health check events."""
         logger.info(f"Health check: {data}")
@@ -502,7 +549,7 @@ Last Update: {datetime.now().strftime('%H:%M:%S')}
                     self._pending_pools[pool_id]['initial_price'] = current_price
                     self._pending_pools[pool_id]['price_received'] = True
                     if self.db_manager:
-                        self.db_manager.update_pool_initial_price(pool_id, current_price)
+                        await self._run_db(self.db_manager.update_pool_initial_price, pool_id, current_price)
 
                 # Check exit conditions for active trades
                 if pool_id in self._active_monitors:
@@ -517,9 +564,9 @@ Last Update: {datetime.now().strftime('%H:%M:%S')}
                         'quote_reserve': data.get('quote_reserve', 0),
                         'volume_24h': data.get('volume_24h', 0),
                         'tvl': data.get('tvl', 0),
-                        'timestamp': int(datetime.now().timestamp() * 1000)
+                        'timestamp': time_ns() // 1_000_000
                     }
-                    self.db_manager.store_pool_snapshot(snapshot_data)
+                    await self._run_db(self.db_manager.store_pool_snapshot, snapshot_data)
 
         except Exception as e:
             logger.error(f"Error processing pool update for {pool_id}: {str(e)}")
@@ -564,6 +611,9 @@ Last Update: {datetime.now().strftime('%H:%M:%S')}
         try:
             logger.info(f"Starting Raydium WebSocket client... Connecting to {self.config.server_url}")
             
+            if self.db_manager:
+                self._db_writer_task = asyncio.create_task(self._db_writer())
+            
             # Attempt connection with timeout
             try:
                 await asyncio.wait_for(
@@ -581,16 +631,12 @@ Last Update: {datetime.now().strftime('%H:%M:%S')}
                 logger.error(f"Connection failed: {str(e)}")
                 raise
             
-            # Keep the client running
-            while True:
-                try:
-                    await asyncio.sleep(1)
-                except asyncio.CancelledError:
-                    logger.info("Client task cancelled")
-                    break
-                except Exception as e:
-                    logger.error(f"Error in main loop: {str(e)}")
-                    await asyncio.sleep(5)  # Wait before retrying
+            # Keep the client running; sio.wait() returns once the connection
+            # is closed for good (disconnect or reconnection attempts exhausted)
+            try:
+                await self.sio.wait()
+            except asyncio.CancelledError:
+                logger.info("Client task cancelled")
                 
         except KeyboardInterrupt:
             logger.info("Shutdown requested by user")
@@ -613,24 +659,38 @@ Last Update: {datetime.now().strftime('%H:%M:%S')}
                 except asyncio.CancelledError:
                     pass
             
-            # Clean up active monitors
-            for pool_id, monitor_data in self._active_monitors.items():
-                if 'task' in monitor_data and not monitor_data['task'].done():
-                    monitor_data['task'].cancel()
-                    try:
-                        await monitor_data['task']
-                    except asyncio.CancelledError:
-                        pass
+            # Clean up active monitors, cancelling them all before waiting on any
+            tasks = [m.task for m in self._active_monitors.values() if m.task is not None and not m.task.done()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
             self._active_monitors.clear()
             
             # Disconnect from server
             if self.sio.connected:
                 await self.sio.disconnect()
             
+            # Stop the DB writer and write whatever it had not picked up yet
+            if self._db_writer_task:
+                self._db_writer_task.cancel()
+                await asyncio.gather(self._db_writer_task, return_exceptions=True)
+            pending = []
+            while not self._db_queue.empty():
+                pending.append(self._db_queue.get_nowait())
+            if pending and self.db_manager:
+                await self._run_db(self._write_db_batch, pending)
+            # Let any in-flight DB call finish before closing the connection,
+            # waiting off the event loop
+            await asyncio.to_thread(self._db_executor.shutdown, True)
+            
             # Close database connection
             if self.db_manager:
                 self.db_manager.close()
             
+            # Persist the paper portfolio and close its trade log
+            if self.paper_trader:
+                self.paper_trader.close()
+            
             logger.info("Shutdown complete")
         except Exception as e:
             logger.error(f"Error during shutdown: {str(e)}")
@@ -762,15 +822,20 @@ Last Update: {datetime.now().strftime('%H:%M:%S')}
                     }
 
                     # Add to active monitors
-                    self._active_monitors[pool_id] = {
-                        'initial_price': initial_price,
-                        'start_time': datetime.now(),
-                        'last_update': datetime.now(),
-                        'status': 'monitoring'
-                    }
+                    # Exit thresholds are percentages of the entry price; store
+                    # them as absolute prices so each update is a plain compare
+                    now = datetime.now()
+                    monitor = PoolMonitorState(
+                        initial_price=initial_price,
+                        target_price=initial_price * (1 + self.config.exit_profit_threshold / 100),
+                        stop_price=initial_price * (1 + self.config.stop_loss_threshold / 100),
+                        start_time=now,
+                        last_update=now
+                    )
+                    self._active_monitors[pool_id] = monitor
 
                     # Create monitoring task
-                    self._monitor_tasks[pool_id] = asyncio.create_task(
+                    monitor.task = self._monitor_tasks[pool_id] = asyncio.create_task(
                         self._monitor_pool(pool_id)
                     )
 
@@ -827,7 +892,7 @@ Active Monitors: {len(self._active_monitors)}/{self._max_concurrent_monitors}
                     current_time = datetime.now()
 
                     # Check if monitoring time exceeded
-                    if (current_time - pool_data['start_time']).total_seconds() > self.config.max_monitor_time:
+                    if (current_time - pool_data.start_time).total_seconds() > self.config.max_monitor_time:
                         logger.info(f"Monitoring time exceeded for pool {pool_id}")
                         await self._stop_pool_monitoring(pool_id)
                         break
@@ -850,17 +915,20 @@ Active Monitors: {len(self._active_monitors)}/{self._max_concurrent_monitors}
         """Check exit conditions for a pool and execute sell if necessary."""
         try:
             pool_data = self._active_monitors[pool_id]
-            entry_price = pool_data['initial_price']
-            price_change = ((current_price - entry_price) / entry_price) * 100
+            entry_price = pool_data.initial_price
             
-            # Log price change for monitored pools
-            logger.info(f"Pool {pool_id} price change: {price_change:.2f}% (Entry: {entry_price:.9f}, Current: {current_price:.9f})")
+            # Log price change for monitored pools (every tick, so debug only)
+            if logger.isEnabledFor(logging.DEBUG):
+                price_change = ((current_price - entry_price) / entry_price) * 100
+                logger.debug(f"Pool {pool_id} price change: {price_change:.2f}% (Entry: {entry_price:.9f}, Current: {current_price:.9f})")
             
             # Check exit conditions
-            if price_change >= self.config.exit_profit_threshold:
+            if current_price >= pool_data.target_price:
+                price_change = ((current_price - entry_price) / entry_price) * 100
                 logger.info(f"🎯 Profit target reached for pool {pool_id} ({price_change:.2f}%)")
                 await self._execute_sell(pool_id, current_price)
-            elif price_change <= self.config.stop_loss_threshold:
+            elif current_price <= pool_data.stop_price:
+                price_change = ((current_price - entry_price) / entry_price) * 100
                 logger.info(f"🛑 Stop loss triggered for pool {pool_id} ({price_change:.2f}%)")
                 await self._execute_sell(pool_id, current_price)
             
@@ -924,7 +992,7 @@ Sell Execution: {(sell_end - sell_start).total_seconds() * 1000:.2f}ms
                 'status': 'failed',
                 'error': str(e),
                 'pool_id': pool_id,
-                'timestamp': int(datetime.now().timestamp() * 1000)
+                'timestamp': time_ns() // 1_000_000
             }
 
     def _log_timing(self, pool_id: str, stage: str, start_time: datetime, end_time: datetime = None):
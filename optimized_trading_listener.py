@@ -6,10 +6,22 @@ import os
 from datetime import datetime
 import socketio
 from colorama import init, Fore, Style
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
 import time
-import threading
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    import ciso8601
+    _parse_iso_timestamp = ciso8601.parse_datetime
+except ImportError:
+    def _parse_iso_timestamp(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Constants
 SERVER_URL = 'http://localhost:5001'
@@ -59,6 +71,8 @@ health_message_count = 0
 trade_history: Dict[str, int] = {}  # pool_id -> timestamp
 hourly_trade_count = 0
 last_hour_reset = datetime.now().hour
+trades_in_flight: Set[str] = set()  # pools with a trade queued or executing
+trades_executing = 0  # trades holding a semaphore slot, not yet counted in hourly_trade_count
 
 # Performance tracking
 trade_latencies: list = []
@@ -71,8 +85,8 @@ log_thread_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Logger")
 # Trade execution semaphore for concurrency control
 trade_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRADES)
 
-def signal_handler(sig, frame):
-    """Handle graceful shutdown on SIGINT (Ctrl+C)"""
+def request_shutdown():
+    """Handle graceful shutdown on SIGINT (Ctrl+C) / SIGTERM, delivered by the event loop"""
     global running, shutdown_requested
     
     if shutdown_requested:
@@ -84,23 +98,14 @@ def signal_handler(sig, frame):
     print(f"{Fore.YELLOW}⏳ Disconnecting from server and cleaning up...{Style.RESET_ALL}")
     
     running = False
-    
-    def force_shutdown():
-        print(f"\n{Fore.RED}Force shutdown after timeout{Style.RESET_ALL}")
-        sys.exit(1)
-    
-    timer = threading.Timer(5.0, force_shutdown)
-    timer.start()
-    
+    asyncio.create_task(shutdown_with_deadline())
+
+async def shutdown_with_deadline():
+    """Run graceful shutdown with a hard 5 second deadline"""
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            asyncio.create_task(graceful_shutdown())
-        else:
-            asyncio.run(graceful_shutdown())
-    except Exception as e:
-        print(f"{Fore.RED}Error during graceful shutdown: {e}{Style.RESET_ALL}")
-        timer.cancel()
+        await asyncio.wait_for(graceful_shutdown(), 5.0)
+    except asyncio.TimeoutError:
+        print(f"\n{Fore.RED}Force shutdown after timeout{Style.RESET_ALL}")
         sys.exit(1)
 
 async def graceful_shutdown():
@@ -123,17 +128,23 @@ async def graceful_shutdown():
     print(f"{Fore.GREEN}✅ Shutdown complete{Style.RESET_ALL}")
     sys.exit(0)
 
-# Register signal handlers
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
+# Pre-serialized payloads for log records whose content never changes
+_DISCONNECT_LOG_PAYLOAD = json.dumps({"status": "disconnected", "server": SERVER_URL}, indent=2)
 
 async def async_log_message(message_type: str, data: dict):
     """Async logging to prevent blocking the event loop"""
     if not running:
         return
+    
+    await async_log_raw(message_type, json.dumps(data, indent=2))
+
+async def async_log_raw(message_type: str, payload: str):
+    """Async logging of an already-serialized payload (no JSON work)"""
+    if not running:
+        return
         
     timestamp = datetime.now().isoformat()
-    log_entry = f"[{timestamp}] {message_type}: {json.dumps(data, indent=2)}\n"
+    log_entry = f"[{timestamp}] {message_type}: {payload}\n"
     
     if ENABLE_ASYNC_LOGGING:
         await log_queue.put(('message', log_entry))
@@ -188,8 +199,17 @@ async def log_worker():
             print(f"{Fore.RED}Error in log worker: {e}{Style.RESET_ALL}")
             await asyncio.sleep(0.1)
 
-def check_rate_limit() -> bool:
-    """Check if we can execute another trade (rate limiting)"""
+@lru_cache(maxsize=4)
+def _format_event_second(second: datetime) -> str:
+    return second.strftime('%Y-%m-%d %H:%M:%S')
+
+def format_event_time(raw_timestamp: Optional[str]) -> str:
+    """Parse an event ISO timestamp and format it to the second (memoized per second)"""
+    timestamp = _parse_iso_timestamp(raw_timestamp or '1970-01-01T00:00:00Z')
+    return _format_event_second(timestamp.replace(microsecond=0))
+
+def check_rate_limit(pending: int = 0) -> bool:
+    """Check if we can execute another trade (rate limiting), counting `pending` trades still executing"""
     global hourly_trade_count, last_hour_reset
     
     current_hour = datetime.now().hour
@@ -200,7 +220,7 @@ def check_rate_limit() -> bool:
         last_hour_reset = current_hour
     
     # Check if we're under the limit
-    if hourly_trade_count >= MAX_TRADES_PER_HOUR:
+    if hourly_trade_count + pending >= MAX_TRADES_PER_HOUR:
         return False
     
     return True
@@ -210,27 +230,16 @@ def increment_trade_count():
     global hourly_trade_count
     hourly_trade_count += 1
 
+def _in_cooldown(pool_id: str) -> bool:
+    """Check if we've already traded this pool recently (5 minutes cooldown per pool)"""
+    last_trade_time = trade_history.get(pool_id)
+    return last_trade_time is not None and time.time() - last_trade_time < 300
+
 async def execute_trade_inline(pool_id: str, base_token: str, quote_token: str) -> bool:
     """Execute trade inline without subprocess overhead"""
     global TRADE_COUNT
     
-    if not TRADING_ENABLED:
-        print(f"{Fore.YELLOW}⚠️  Trading is disabled (AUTO_TRADING_ENABLED=false){Style.RESET_ALL}")
-        return False
-    
-    # Check rate limiting
-    if not check_rate_limit():
-        print(f"{Fore.YELLOW}⚠️  Rate limit exceeded ({MAX_TRADES_PER_HOUR} trades/hour){Style.RESET_ALL}")
-        return False
-    
-    # Check if we've already traded this pool recently
     current_time = datetime.now()
-    if pool_id in trade_history:
-        last_trade_time = datetime.fromtimestamp(trade_history[pool_id])
-        time_diff = (current_time - last_trade_time).total_seconds()
-        if time_diff < 300:  # 5 minutes cooldown per pool
-            print(f"{Fore.YELLOW}⚠️  Already traded pool {pool_id} recently (cooldown){Style.RESET_ALL}")
-            return False
     
     # Record trade start time for latency tracking
     trade_start = time.time()
@@ -304,9 +313,44 @@ async def execute_trade_inline(pool_id: str, base_token: str, quote_token: str)
             del trade_start_times[pool_id]
 
 async def execute_trade(pool_id: str, base_token: str, quote_token: str) -> bool:
-    """Execute trade with concurrency control"""
-    async with trade_semaphore:
-        return await execute_trade_inline(pool_id, base_token, quote_token)
+    """Execute trade with concurrency control; cheap rejects never wait for a trade slot"""
+    global trades_executing
+    
+    if not TRADING_ENABLED:
+        print(f"{Fore.YELLOW}⚠️  Trading is disabled (AUTO_TRADING_ENABLED=false){Style.RESET_ALL}")
+        return False
+    
+    # Check rate limiting
+    if not check_rate_limit():
+        print(f"{Fore.YELLOW}⚠️  Rate limit exceeded ({MAX_TRADES_PER_HOUR} trades/hour){Style.RESET_ALL}")
+        return False
+    
+    if _in_cooldown(pool_id):
+        print(f"{Fore.YELLOW}⚠️  Already traded pool {pool_id} recently (cooldown){Style.RESET_ALL}")
+        return False
+    
+    if pool_id in trades_in_flight:
+        print(f"{Fore.YELLOW}⚠️  Trade already in progress for pool {pool_id}{Style.RESET_ALL}")
+        return False
+    
+    # Claim the pool before the first await so repeated events for it are rejected above
+    trades_in_flight.add(pool_id)
+    try:
+        async with trade_semaphore:
+            # Re-check: other trades may have completed while this one waited for a slot
+            if not check_rate_limit(trades_executing):
+                print(f"{Fore.YELLOW}⚠️  Rate limit exceeded ({MAX_TRADES_PER_HOUR} trades/hour){Style.RESET_ALL}")
+                return False
+            if _in_cooldown(pool_id):
+                print(f"{Fore.YELLOW}⚠️  Already traded pool {pool_id} recently (cooldown){Style.RESET_ALL}")
+                return False
+            trades_executing += 1
+            try:
+                return await execute_trade_inline(pool_id, base_token, quote_token)
+            finally:
+                trades_executing -= 1
+    finally:
+        trades_in_flight.discard(pool_id)
 
 @sio.event
 async def connect():
@@ -349,7 +393,7 @@ async def disconnect():
     if not running:
         return
         
-    await async_log_message("DISCONNECT", {"status": "disconnected", "server": SERVER_URL})
+    await async_log_raw("DISCONNECT", _DISCONNECT_LOG_PAYLOAD)
     print(f"{Fore.YELLOW}⚠️  Disconnected from server{Style.RESET_ALL}")
 
 @sio.on('pool_status_6')
@@ -368,8 +412,7 @@ async def on_pool_status_6(data):
     })
     
     try:
-        timestamp = datetime.fromisoformat(data.get('timestamp', '').replace('Z', '+00:00'))
-        formatted_time = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        formatted_time = format_event_time(data.get('timestamp'))
         
         print(f"\n{Fore.BLUE}[{formatted_time}] 🎯 STATUS 6 DETECTED:{Style.RESET_ALL}")
         print(f"{Fore.BLUE}Pool ID: {data.get('pool_id', 'N/A')}{Style.RESET_ALL}")
@@ -409,8 +452,7 @@ async def on_pool_ready(data):
     })
     
     try:
-        timestamp = datetime.fromisoformat(data.get('timestamp', '').replace('Z', '+00:00'))
-        formatted_time = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        formatted_time = format_event_time(data.get('timestamp'))
         
         print(f"\n{Fore.GREEN}[{formatted_time}] 🎯 POOL READY FOR TRADING:{Style.RESET_ALL}")
         print(f"{Fore.GREEN}════════════════════════════════════════════════════════════════════════════════{Style.RESET_ALL}")
@@ -508,6 +550,11 @@ async def main():
     print(f"{Fore.CYAN}Starting Optimized Trading Listener...{Style.RESET_ALL}")
     print(f"{Fore.CYAN}Connecting to Socket.IO server at {SERVER_URL}...{Style.RESET_ALL}")
     
+    # Register signal handlers on the running loop
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGINT, request_shutdown)
+    loop.add_signal_handler(signal.SIGTERM, request_shutdown)
+    
     # Create log directories if they don't exist
     os.makedirs('logs', exist_ok=True)
     
@@ -533,6 +580,8 @@ async def main():
         print(f"{Fore.GREEN}Optimized trading listener stopped{Style.RESET_ALL}")
 
 if __name__ == '__main__':
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
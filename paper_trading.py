@@ -2,61 +2,292 @@
 Paper trading manager for simulating trades without real funds.
 """
 
+import atexit
 import json
 import logging
+import threading
+import time
+from collections import deque
 from datetime import datetime
 from decimal import Decimal, ROUND_DOWN
-from typing import Dict, Any, Optional
-from pathlib import Path
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Optional, Tuple
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _encode(o: Any) -> str:
+    """Serialize Decimals as strings; anything else JSON can't encode is an error."""
+    if isinstance(o, Decimal):
+        return str(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+class DecimalEncoder(json.JSONEncoder):
+    """JSON encoder that writes Decimals as strings without copying the data."""
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, Decimal):
+            return str(o)
+        return super().default(o)
+
+def _dumps_portfolio(data: Dict[str, Any]) -> bytes:
+    """Serialize the portfolio, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_encode, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, cls=DecimalEncoder, indent=2).encode('utf-8')
+
+def _dumps_trade_line(trade: Dict[str, Any]) -> bytes:
+    """Serialize a single trade as one JSONL line."""
+    if orjson is not None:
+        return orjson.dumps(trade, default=_encode) + b'\n'
+    return (json.dumps(trade, cls=DecimalEncoder) + '\n').encode('utf-8')
+
+@lru_cache(maxsize=4096)
+def _D(value: Any) -> Decimal:
+    """Decimal(str(value)), memoized since prices and amounts repeat a lot."""
+    return Decimal(str(value))
+
+_ZERO = Decimal('0')
+STARTING_SOL_BALANCE = Decimal('10.0')
+
+# Trade arithmetic runs in integer fixed-point: amounts in 1e-9 units (lamports for SOL)
+# and prices scaled by PRICE_SCALE. Decimal is only used at the portfolio/API boundary.
+AMOUNT_SCALE = 10 ** 9
+PRICE_SCALE = 10 ** 18  # keeps ~9 significant digits even for 1e-9 SOL prices
+
+def _to_fixed(value: Any, scale: int) -> int:
+    """Convert a Decimal/float/str amount to fixed-point units (rounded down)."""
+    return int((_D(value) * scale).to_integral_value(rounding=ROUND_DOWN))
+
+def _from_fixed(units: int, scale: int = AMOUNT_SCALE) -> Decimal:
+    """Convert fixed-point units back to a Decimal amount."""
+    return Decimal(units) / scale
+
+# For paper trading, we'll use a simple mock price
+# This is fine since our exit strategy is based on percentage changes
+MOCK_PRICE = Decimal('0.000001')  # 1 SOL = 1,000,000 tokens
+MOCK_PRICE_FIXED = _to_fixed(MOCK_PRICE, PRICE_SCALE)
+
+# Recent trades kept in memory; the full history lives in the trade log
+MAX_TRADES_IN_MEMORY = 1000
+
+# How often the background flusher persists a dirty portfolio (seconds)
+FLUSH_INTERVAL = 0.25
+
 class PaperTradingManager:
-    def __init__(self, portfolio_file: str = 'paper_portfolio.json'):
-        """Initialize paper trading manager with portfolio tracking."""
+    def __init__(self, portfolio_file: str = 'paper_portfolio.json', trade_log_file: Optional[str] = None):
+        """Initialize paper trading manager with portfolio tracking.
+
+        Trades are appended to a JSONL log (``<portfolio>_trades.jsonl`` by default);
+        the portfolio file itself only snapshots balances and positions.
+        """
         self.portfolio_file = portfolio_file
+        self.trade_log_file = trade_log_file or os.path.splitext(portfolio_file)[0] + '_trades.jsonl'
         self.portfolio = self._load_portfolio()
+        self._trade_log = open(self.trade_log_file, 'ab', buffering=1 << 16)
         self.min_price = Decimal('0.000000001')  # Minimum price to prevent zero-price trades
         self.min_liquidity = Decimal('0.5')  # Minimum liquidity in SOL
         self.max_price_impact = Decimal('0.05')  # Maximum price impact (5%)
 
+        # Saves are debounced: mutations mark the portfolio dirty and a
+        # background thread persists it at most once per FLUSH_INTERVAL.
+        self._dirty = False
+        self._save_lock = threading.RLock()
+        # Rendered get_position() views, invalidated by a per-position version counter
+        self._pos_version: Dict[str, int] = {}
+        self._position_views: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        self._restore_trades()
+        self._closed = threading.Event()
+        self._flusher_thread = threading.Thread(target=self._flusher, name='PaperPortfolioFlusher', daemon=True)
+        self._flusher_thread.start()
+        atexit.register(self.close)
+
+    def _default_portfolio(self) -> Dict[str, Any]:
+        """Create a fresh portfolio."""
+        return {
+            'balance': {
+                'SOL': STARTING_SOL_BALANCE,  # Starting with 10 SOL
+            },
+            'positions': {},
+            'trade_count': 0,
+            'last_update': datetime.now().isoformat()
+        }
+
     def _load_portfolio(self) -> Dict[str, Any]:
         """Load portfolio state from file or create new."""
         try:
-            if os.path.exists(self.portfolio_file):
-                with open(self.portfolio_file, 'r') as f:
-                    return json.load(f, parse_float=Decimal)
-            return {
-                'balance': {
-                    'SOL': Decimal('10.0'),  # Starting with 10 SOL
-                },
-                'positions': {},
-                'trades': [],
-                'last_update': datetime.now().isoformat()
-            }
+            # Single open (no separate exists() stat); json decodes bytes directly
+            with open(self.portfolio_file, 'rb') as f:
+                portfolio = json.loads(f.read(), parse_float=Decimal)
+            # Balances are saved as strings; restore them as Decimals
+            portfolio['balance'] = {mint: _D(amount) for mint, amount in portfolio['balance'].items()}
+            return portfolio
+        except FileNotFoundError:
+            return self._default_portfolio()
         except Exception as e:
             logger.error(f"Error loading portfolio: {e}")
-            return {
-                'balance': {
-                    'SOL': Decimal('10.0'),
-                },
-                'positions': {},
-                'trades': [],
-                'last_update': datetime.now().isoformat()
-            }
+            return self._default_portfolio()
+
+    def _iter_trade_log(self) -> Iterator[Dict[str, Any]]:
+        """Stream the trades recorded in the append-only trade log."""
+        try:
+            with open(self.trade_log_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error reading trade log: {e}")
+
+    def _restore_trades(self) -> None:
+        """Rebuild trade history from the log and replay trades newer than the snapshot.
+
+        The log is streamed once; only the bounded in-memory history and the
+        trades newer than the snapshot are kept.
+        """
+        legacy_trades = self.portfolio.pop('trades', None) or []
+        snapshot_count = self.portfolio.get('trade_count', len(legacy_trades))
+
+        # Trades are kept outside self.portfolio so the snapshot can be saved as-is
+        self.trades = deque(maxlen=MAX_TRADES_IN_MEMORY)
+        self._mint_to_pool: Dict[str, str] = {}
+        self._buy_base_mint_by_pool: Dict[str, str] = {}
+        stale_trades = []
+        trade_count = 0
+
+        def index(trade: Dict[str, Any]) -> None:
+            nonlocal trade_count
+            trade_count += 1
+            self.trades.append(trade)
+            if trade['type'] == 'buy' and trade.get('base_mint'):
+                self._mint_to_pool[trade['base_mint']] = trade['pool_id']
+                self._buy_base_mint_by_pool.setdefault(trade['pool_id'], trade['base_mint'])
+            if trade_count > snapshot_count:
+                stale_trades.append(trade)
+
+        for trade in self._iter_trade_log():
+            index(trade)
+
+        if not trade_count and legacy_trades:
+            # Older snapshots embedded the full history; seed the log from it once
+            for trade in legacy_trades:
+                self._trade_log.write(_dumps_trade_line(trade))
+                index(trade)
+            self._trade_log.flush()
+
+        self.portfolio['trade_count'] = trade_count
+        for trade in stale_trades:
+            self._apply_logged_trade(trade)
+        if stale_trades:
+            logger.info(f"Replayed {len(stale_trades)} trades newer than the portfolio snapshot")
+            self._mark_dirty()
+
+    def _apply_logged_trade(self, trade: Dict[str, Any]) -> None:
+        """Apply the balance/position effects of a logged trade to the snapshot."""
+        balance = self.portfolio['balance']
+        pool_id = trade['pool_id']
+        base_mint = trade.get('base_mint') or self._buy_base_mint_by_pool.get(pool_id)
+        base_amount = _D(trade['base_amount'])
+        quote_amount = _D(trade['quote_amount'])
+
+        if trade['type'] == 'buy':
+            balance['SOL'] = _D(balance['SOL']) - quote_amount
+            if base_mint:
+                balance[base_mint] = _D(balance.get(base_mint, 0)) + base_amount
+                self._mint_to_pool[base_mint] = pool_id
+                self._buy_base_mint_by_pool.setdefault(pool_id, base_mint)
+            self.portfolio['positions'].setdefault(pool_id, {
+                'entry_price': trade['price'],
+                'entry_amount': trade['base_amount'],
+                'entry_timestamp': trade['timestamp'],
+                'status': 'open'
+            })
+            self._bump_position(pool_id)
+        else:
+            balance['SOL'] = _D(balance['SOL']) + quote_amount
+            if base_mint:
+                balance[base_mint] = _D(balance.get(base_mint, 0)) - base_amount
+            position = self.portfolio['positions'].get(pool_id)
+            if position:
+                position.update({
+                    'exit_price': trade['price'],
+                    'exit_amount': trade['base_amount'],
+                    'exit_timestamp': trade['timestamp'],
+                    'pnl': trade.get('pnl'),
+                    'pnl_percentage': trade.get('pnl_percentage'),
+                    'price_change_percentage': trade.get('price_change_percentage'),
+                    'status': 'closed'
+                })
+                self._bump_position(pool_id)
+
+    def _bump_position(self, pool_id: str) -> None:
+        """Invalidate the cached get_position() view for a pool."""
+        self._pos_version[pool_id] = self._pos_version.get(pool_id, 0) + 1
+
+    def _record_trade(self, trade: Dict[str, Any]) -> None:
+        """Append a trade to the bounded in-memory history and the trade log."""
+        self.trades.append(trade)
+        self._trade_log.write(_dumps_trade_line(trade))
+        self.portfolio['trade_count'] += 1
 
     def _save_portfolio(self) -> bool:
-        """Save portfolio state to file."""
+        """Save a snapshot of balances and positions to file."""
         try:
             self.portfolio['last_update'] = datetime.now().isoformat()
-            with open(self.portfolio_file, 'w') as f:
-                json.dump(self.portfolio, f, default=str, indent=2)
+            # Trades live in the append-only log; make sure it is ahead of the snapshot
+            self._trade_log.flush()
+            # Encode first, then issue a single write instead of json.dump's many small ones
+            payload = _dumps_portfolio(self.portfolio)
+            # Write to a temp file and atomically swap it in so a crash mid-write
+            # never leaves a truncated portfolio behind
+            tmp_file = self.portfolio_file + '.tmp'
+            with open(tmp_file, 'wb', buffering=1 << 20) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.portfolio_file)
             return True
         except Exception as e:
             logger.error(f"Error saving portfolio: {e}")
             return False
 
+    def _mark_dirty(self) -> None:
+        """Schedule the portfolio to be persisted by the background flusher."""
+        self._dirty = True
+
+    def _flusher(self) -> None:
+        """Background loop that persists the portfolio when it is dirty."""
+        while not self._closed.wait(FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self) -> bool:
+        """Persist the portfolio now if it has unsaved changes."""
+        with self._save_lock:
+            if not self._dirty:
+                return True
+            self._dirty = False
+            if not self._save_portfolio():
+                self._dirty = True
+                return False
+            return True
+
+    def close(self) -> None:
+        """Stop the flusher, persist unsaved changes and close the trade log."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flusher_thread.join()
+        with self._save_lock:
+            self.flush()
+            self._trade_log.close()
+        atexit.unregister(self.close)
+
     def _validate_trade(self, pool_id: str, price: Decimal, amount: Decimal) -> bool:
         """Validate trade parameters."""
         if price <= 0:
@@ -79,47 +310,52 @@ class PaperTradingManager:
                    price: Decimal, base_decimals: int, quote_decimals: int, 
                    sol_amount: Decimal) -> Dict[str, Any]:
         """Execute a paper buy trade."""
+        ts_ms = time.time_ns() // 1_000_000
         try:
-            # Convert amounts to Decimal
-            sol_amount = Decimal(str(sol_amount))
+            # Convert amounts to fixed-point units
+            sol_units = _to_fixed(sol_amount, AMOUNT_SCALE)
+            token_units = sol_units * PRICE_SCALE // MOCK_PRICE_FIXED
             
-            # For paper trading, we'll use a simple mock price
-            # This is fine since our exit strategy is based on percentage changes
-            mock_price = Decimal('0.000001')  # 1 SOL = 1,000,000 tokens
-            token_amount = (sol_amount / mock_price).quantize(Decimal('0.000000001'), rounding=ROUND_DOWN)
+            mock_price = MOCK_PRICE
+            sol_amount = _from_fixed(sol_units)
+            token_amount = _from_fixed(token_units)
             
-            # Update portfolio
-            self.portfolio['balance']['SOL'] -= sol_amount
-            if base_mint not in self.portfolio['balance']:
-                self.portfolio['balance'][base_mint] = Decimal('0')
-            self.portfolio['balance'][base_mint] += token_amount
-            
-            # Record trade
-            trade = {
-                'pool_id': pool_id,
-                'type': 'buy',
-                'timestamp': int(datetime.now().timestamp() * 1000),
-                'price': float(mock_price),
-                'base_amount': float(token_amount),
-                'quote_amount': float(sol_amount),
-                'base_mint': base_mint,
-                'quote_mint': quote_mint,
-                'tx_signature': f"paper_buy_{pool_id}_{int(datetime.now().timestamp() * 1000)}",
-                'status': 'confirmed'
-            }
-            self.portfolio['trades'].append(trade)
+            with self._save_lock:
+                # Update portfolio
+                self.portfolio['balance']['SOL'] -= sol_amount
+                if base_mint not in self.portfolio['balance']:
+                    self.portfolio['balance'][base_mint] = _ZERO
+                self.portfolio['balance'][base_mint] += token_amount
             
-            # Update position with mock price
-            if pool_id not in self.portfolio['positions']:
-                self.portfolio['positions'][pool_id] = {
-                    'entry_price': float(mock_price),
-                    'entry_amount': float(token_amount),
-                    'entry_timestamp': trade['timestamp'],
-                    'status': 'open'
+                # Record trade
+                trade = {
+                    'pool_id': pool_id,
+                    'type': 'buy',
+                    'timestamp': ts_ms,
+                    'price': float(mock_price),
+                    'base_amount': float(token_amount),
+                    'quote_amount': float(sol_amount),
+                    'base_mint': base_mint,
+                    'quote_mint': quote_mint,
+                    'tx_signature': f"paper_buy_{pool_id}_{ts_ms}",
+                    'status': 'confirmed'
                 }
+                self._record_trade(trade)
+                self._mint_to_pool[base_mint] = pool_id
+                self._buy_base_mint_by_pool.setdefault(pool_id, base_mint)
             
-            # Save portfolio state
-            self._save_portfolio()
+                # Update position with mock price
+                if pool_id not in self.portfolio['positions']:
+                    self.portfolio['positions'][pool_id] = {
+                        'entry_price': float(mock_price),
+                        'entry_amount': float(token_amount),
+                        'entry_timestamp': trade['timestamp'],
+                        'status': 'open'
+                    }
+                    self._bump_position(pool_id)
+            
+                # Schedule portfolio save
+                self._mark_dirty()
             
             logger.info(f"✅ Paper trade executed: {token_amount} tokens for {sol_amount} SOL")
             logger.info(f"Pool: {pool_id}")
@@ -143,70 +379,82 @@ class PaperTradingManager:
                 'status': 'failed',
                 'error': str(e),
                 'pool_id': pool_id,
-                'timestamp': int(datetime.now().timestamp() * 1000)
+                'timestamp': ts_ms
             }
 
     def execute_sell(self, pool_id: str, current_price: Decimal) -> Dict[str, Any]:
         """Execute a paper sell trade."""
+        ts_ms = time.time_ns() // 1_000_000
         try:
-            # Get position
-            if pool_id not in self.portfolio['positions']:
-                raise ValueError(f"No open position for pool {pool_id}")
+            with self._save_lock:
+                # Get position
+                if pool_id not in self.portfolio['positions']:
+                    raise ValueError(f"No open position for pool {pool_id}")
             
-            position = self.portfolio['positions'][pool_id]
-            if position['status'] != 'open':
-                raise ValueError(f"Position for pool {pool_id} is not open")
+                position = self.portfolio['positions'][pool_id]
+                if position['status'] != 'open':
+                    raise ValueError(f"Position for pool {pool_id} is not open")
             
-            # Get token amount and calculate SOL value
-            token_amount = Decimal(str(position['entry_amount']))
-            entry_price = Decimal(str(position['entry_price']))
+                # Get token amount and calculate SOL value in fixed-point units
+                entry_price = position['entry_price']
+                token_units = _to_fixed(position['entry_amount'], AMOUNT_SCALE)
+                entry_price_fixed = _to_fixed(entry_price, PRICE_SCALE)
+                current_price_fixed = _to_fixed(current_price, PRICE_SCALE)
+                if entry_price_fixed <= 0:
+                    raise ValueError(f"Invalid entry price ({entry_price}) for pool {pool_id}")
             
-            # For paper trading, we'll simulate a price change based on percentage
-            # This ensures our exit strategy based on percentage changes works correctly
-            price_change_percentage = ((current_price - entry_price) / entry_price) * 100
-            sol_value = (token_amount * current_price).quantize(Decimal('0.000000001'), rounding=ROUND_DOWN)
+                # For paper trading, we'll simulate a price change based on percentage
+                # This ensures our exit strategy based on percentage changes works correctly
+                price_change_percentage = (current_price_fixed - entry_price_fixed) * 100 / entry_price_fixed
+                sol_units = token_units * current_price_fixed // PRICE_SCALE
+                token_amount = _from_fixed(token_units)
+                sol_value = _from_fixed(sol_units)
             
-            # Update portfolio
-            self.portfolio['balance']['SOL'] += sol_value
-            base_mint = next((t['base_mint'] for t in self.portfolio['trades'] 
-                            if t['pool_id'] == pool_id and t['type'] == 'buy'), None)
-            if base_mint:
-                self.portfolio['balance'][base_mint] -= token_amount
+                # Update portfolio
+                self.portfolio['balance']['SOL'] += sol_value
+                base_mint = self._buy_base_mint_by_pool.get(pool_id)
+                if base_mint:
+                    self.portfolio['balance'][base_mint] -= token_amount
             
-            # Calculate PnL
-            entry_value = token_amount * entry_price
-            pnl = sol_value - entry_value
-            pnl_percentage = (pnl / entry_value) * 100
+                # Calculate PnL
+                entry_value_units = token_units * entry_price_fixed // PRICE_SCALE
+                if entry_value_units <= 0:
+                    raise ValueError(f"Position for pool {pool_id} has no entry value")
+                pnl_units = sol_units - entry_value_units
+                pnl = _from_fixed(pnl_units)
+                pnl_percentage = pnl_units * 100 / entry_value_units
             
-            # Record trade
-            trade = {
-                'pool_id': pool_id,
-                'type': 'sell',
-                'timestamp': int(datetime.now().timestamp() * 1000),
-                'price': float(current_price),
-                'base_amount': float(token_amount),
-                'quote_amount': float(sol_value),
-                'pnl': float(pnl),
-                'pnl_percentage': float(pnl_percentage),
-                'price_change_percentage': float(price_change_percentage),
-                'tx_signature': f"paper_sell_{pool_id}_{int(datetime.now().timestamp() * 1000)}",
-                'status': 'confirmed'
-            }
-            self.portfolio['trades'].append(trade)
+                # Record trade
+                trade = {
+                    'pool_id': pool_id,
+                    'type': 'sell',
+                    'timestamp': ts_ms,
+                    'price': float(current_price),
+                    'base_amount': float(token_amount),
+                    'quote_amount': float(sol_value),
+                    'pnl': float(pnl),
+                    'pnl_percentage': float(pnl_percentage),
+                    'price_change_percentage': float(price_change_percentage),
+                    'base_mint': base_mint,
+                    'tx_signature': f"paper_sell_{pool_id}_{ts_ms}",
+                    'status': 'confirmed'
+                }
+                self._record_trade(trade)
             
-            # Update position
-            position.update({
-                'exit_price': float(current_price),
-                'exit_amount': float(token_amount),
-                'exit_timestamp': trade['timestamp'],
-                'pnl': float(pnl),
-                'pnl_percentage': float(pnl_percentage),
-                'price_change_percentage': float(price_change_percentage),
-                'status': 'closed'
-            })
+                # Update position
+                position.update({
+                    'exit_price': float(current_price),
+                    'exit_amount': float(token_amount),
+                    'exit_timestamp': trade['timestamp'],
+                    'pnl': float(pnl),
+                    'pnl_percentage': float(pnl_percentage),
+                    'price_change_percentage': float(price_change_percentage),
+                    'status': 'closed'
+                })
+                self._bump_position(pool_id)
             
-            # Save portfolio state
-            self._save_portfolio()
+                # Schedule portfolio save
+                self._mark_dirty()
             
             logger.info(f"✅ Paper sell executed: {token_amount} tokens for {sol_value} SOL")
             logger.info(f"Pool: {pool_id}")
@@ -234,16 +482,31 @@ class PaperTradingManager:
                 'status': 'failed',
                 'error': str(e),
                 'pool_id': pool_id,
-                'timestamp': int(datetime.now().timestamp() * 1000)
+                'timestamp': ts_ms
             }
 
     def get_position(self, pool_id: str) -> Optional[Dict[str, Any]]:
-        """Get current position for a pool."""
-        return self.portfolio['positions'].get(pool_id)
+        """Get current position for a pool.
+
+        Returns a detached copy with Decimal fields rendered as floats, not the
+        live position dict; the float rendering is cached until the position
+        changes, and each call hands out a fresh copy of it.
+        """
+        position = self.portfolio['positions'].get(pool_id)
+        if position is None:
+            return None
+        version = self._pos_version.get(pool_id, 0)
+        cached = self._position_views.get(pool_id)
+        if cached is not None and cached[0] == version:
+            return dict(cached[1])
+        view = {key: float(value) if isinstance(value, Decimal) else value
+                for key, value in position.items()}
+        self._position_views[pool_id] = (version, view)
+        return dict(view)
 
     def get_balance(self, token_mint: str = 'SOL') -> Decimal:
         """Get current balance for a token."""
-        return Decimal(str(self.portfolio['balance'].get(token_mint, 0)))
+        return _D(self.portfolio['balance'].get(token_mint, 0))
 
     def get_portfolio_value(self) -> Decimal:
         """Calculate total portfolio value in SOL."""
@@ -252,8 +515,7 @@ class PaperTradingManager:
             if mint != 'SOL':
                 # In a real implementation, we would fetch current prices
                 # For paper trading, we'll use entry prices for open positions
-                position = next((p for p in self.portfolio['positions'].values() 
-                               if p['status'] == 'open'), None)
-                if position:
-                    total += Decimal(str(amount)) * Decimal(str(position['entry_price']))
+                position = self.portfolio['positions'].get(self._mint_to_pool.get(mint))
+                if position and position['status'] == 'open':
+                    total += _D(amount) * _D(position['entry_price'])
         return total 
\ No newline at end of file
@@ -3,13 +3,16 @@ Pool monitor for tracking and trading new Raydium pools.
 """
 
 import logging
-import time
 import os
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import asyncio
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from solana.rpc.async_api import AsyncClient
+from solders.pubkey import Pubkey  # type: ignore
 from db_manager import DatabaseManager
 from paper_trading import PaperTradingManager
 from dotenv import load_dotenv
@@ -22,24 +25,76 @@ MIN_LIQUIDITY_SOL = Decimal(os.getenv('MIN_LIQUIDITY', '0.5'))
 MIN_PRICE = Decimal('0.000000001')  # Minimum price to prevent zero-price trades
 MAX_PRICE_IMPACT = Decimal(os.getenv('MAX_PRICE_IMPACT', '0.05'))
 TRADE_AMOUNT_SOL = Decimal(os.getenv('INITIAL_BUY', '0.005'))
-MONITOR_INTERVAL = int(os.getenv('MONITOR_INTERVAL', '1'))  # seconds
-PRICE_CHECK_INTERVAL = int(os.getenv('PRICE_CHECK_INTERVAL', '5'))  # seconds
+# Price refresh cadence; monitored pools only wake when the fetcher publishes a price
+PRICE_CHECK_INTERVAL = float(os.getenv('PRICE_CHECK_INTERVAL', '5'))  # seconds
 MAX_MONITOR_TIME = int(os.getenv('MAX_MONITOR_TIME', '3600'))  # 1 hour in seconds
-PROFIT_THRESHOLD = Decimal(os.getenv('EXIT_PROFIT_THRESHOLD', '0.1'))
-STOP_LOSS_THRESHOLD = Decimal(os.getenv('STOP_LOSS_THRESHOLD', '-0.1'))
+# Profit/stop-loss comparisons are done in float; Decimal is kept for trade amounts
+PROFIT_THRESHOLD = float(os.getenv('EXIT_PROFIT_THRESHOLD', '0.1'))
+STOP_LOSS_THRESHOLD = float(os.getenv('STOP_LOSS_THRESHOLD', '-0.1'))
+
+REQUIRED_POOL_FIELDS = frozenset({'base_mint', 'quote_mint', 'price', 'liquidity', 'timestamp'})
+NUMERIC_TYPES = (int, float, str, Decimal)
+
+# Trade/position rows are written to SQLite in one transaction per flush
+DB_FLUSH_INTERVAL = 0.5  # seconds
+DB_FLUSH_BATCH_SIZE = 100
+
+# getMultipleAccounts accepts up to 100 keys; each pool needs two vault accounts
+MAX_POOLS_PER_PRICE_BATCH = 50
+WSOL_MINT = "So11111111111111111111111111111111111111112"
+WSOL_MINT_BYTES = bytes(Pubkey.from_string(WSOL_MINT))
+# LIQUIDITY_STATE_LAYOUT_V4 (swap/layouts/amm_v4.py) as one precompiled struct:
+# 32 u64 fields, the u128/u64 swap counters, then 13 pubkeys (752 bytes)
+AMM_V4_STATE = struct.Struct('<32Q16s16sQ16s16sQ' + '32s' * 13)
+AMM_COIN_DECIMALS, AMM_PC_DECIMALS = 4, 5
+AMM_NEED_TAKE_PNL_COIN, AMM_NEED_TAKE_PNL_PC = 24, 25
+AMM_COIN_VAULT, AMM_PC_VAULT, AMM_COIN_MINT = 38, 39, 40
+# SPL token account: mint (32) + owner (32) + amount (u64)
+TOKEN_ACCOUNT_AMOUNT = struct.Struct('<Q')
+TOKEN_ACCOUNT_AMOUNT_OFFSET = 64
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class PoolState:
+    """Per-pool monitoring state read and written on every price update."""
+    data: Dict[str, Any]
+    consecutive_profit_updates: int = 0
+    status: str = 'monitoring'  # 'monitoring' -> 'trading' -> 'closed'
+    price_updated: asyncio.Event = field(default_factory=asyncio.Event)
+    current_price_dec: Optional[Decimal] = None
+    current_price: float = 0.0
+    profit_pct: float = 0.0
+    entry_price_dec: Optional[Decimal] = None
+    entry_price: Optional[float] = None
+    entry_timestamp: Optional[int] = None
+
 class PoolMonitor:
+    __slots__ = ('db', 'paper_trading', 'rpc_client', 'active_pools', 'monitor_tasks', 'stop_event',
+                 'price_fetcher_task', '_pending_writes', 'write_flusher_task', '_flush_requested',
+                 '_db_executor')
+
     def __init__(self, db_manager: DatabaseManager, paper_trading: PaperTradingManager,
                  rpc_client: AsyncClient):
-        """Initialize pool monitor with database and trading managers."""
+        """Initialize pool monitor with database and trading managers.
+
+        All DatabaseManager calls run on a dedicated worker thread, so the
+        manager must be created with check_same_thread=False.
+        """
         self.db = db_manager
         self.paper_trading = paper_trading
         self.rpc_client = rpc_client
-        self.active_pools: Dict[str, Dict[str, Any]] = {}
+        self.active_pools: Dict[str, PoolState] = {}
         self.monitor_tasks: Dict[str, asyncio.Task] = {}
         self.stop_event = asyncio.Event()
+        self.price_fetcher_task: Optional[asyncio.Task] = None
+        # Buffered DB writes: (kind, row) with kind in 'trade', 'position', 'position_exit'
+        self._pending_writes: List[Tuple[str, Dict[str, Any]]] = []
+        self.write_flusher_task: Optional[asyncio.Task] = None
+        # Set by _queue_write to wake the flusher early once a batch is full
+        self._flush_requested = asyncio.Event()
+        # All SQLite calls run on this one worker so commits never block the event loop
+        self._db_executor = ThreadPoolExecutor(max_workers=1)
 
     async def start_monitoring(self, pool_id: str, pool_data: Dict[str, Any]) -> None:
         """Start monitoring a new pool."""
@@ -59,18 +114,14 @@ class PoolMonitor:
                 return
 
             # Add to active pools
-            self.active_pools[pool_id] = {
-                'data': pool_data,
-                'start_time': int(time.time() * 1000),
-                'last_price_check': int(time.time() * 1000),
-                'consecutive_profit_updates': 0,
-                'status': 'monitoring'
-            }
+            self.active_pools[pool_id] = PoolState(data=pool_data)
 
             # Start monitoring task
             self.monitor_tasks[pool_id] = asyncio.create_task(
                 self._monitor_pool(pool_id)
             )
+            self._ensure_price_fetcher()
+            self._ensure_write_flusher()
 
             logger.info(f"Started monitoring pool {pool_id}")
             logger.info(f"Base Token: {pool_data['base_mint']}")
@@ -85,9 +136,13 @@ class PoolMonitor:
     def _validate_pool_data(self, pool_id: str, pool_data: Dict[str, Any]) -> bool:
         """Validate pool data before monitoring."""
         try:
-            required_fields = ['base_mint', 'quote_mint', 'price', 'liquidity', 'timestamp']
-            if not all(field in pool_data for field in required_fields):
-                logger.error(f"Missing required fields in pool data for {pool_id}")
+            missing = REQUIRED_POOL_FIELDS - pool_data.keys()
+            if missing:
+                logger.error(f"Missing required fields {sorted(missing)} in pool data for {pool_id}")
+                return False
+
+            if not isinstance(pool_data['price'], NUMERIC_TYPES) or not isinstance(pool_data['liquidity'], NUMERIC_TYPES):
+                logger.error(f"Non-numeric price or liquidity in pool data for {pool_id}")
                 return False
 
             # Convert to Decimal for validation
@@ -122,45 +177,45 @@ class PoolMonitor:
                 'status': 'active'
             }
             
-            return await self.db.store_pool(data)
+            return await self._run_db(self.db.store_pool, data)
 
         except Exception as e:
             logger.error(f"Error storing pool data: {e}")
             return False
 
     async def _monitor_pool(self, pool_id: str) -> None:
-        """Monitor pool for trading opportunities."""
+        """Monitor pool for trading opportunities until MAX_MONITOR_TIME elapses."""
         try:
-            pool_info = self.active_pools[pool_id]
-            start_time = pool_info['start_time']
-            
-            while not self.stop_event.is_set():
-                current_time = int(time.time() * 1000)
-                
-                # Check if monitoring time exceeded
-                if current_time - start_time > MAX_MONITOR_TIME:
-                    logger.info(f"Monitoring time exceeded for pool {pool_id}")
-                    await self._stop_monitoring(pool_id)
-                    break
+            await asyncio.wait_for(self._price_loop(pool_id), timeout=MAX_MONITOR_TIME)
+
+        except asyncio.TimeoutError:
+            logger.info(f"Monitoring time exceeded for pool {pool_id}")
 
-                # Check if it's time for price check
-                if current_time - pool_info['last_price_check'] >= PRICE_CHECK_INTERVAL:
-                    await self._check_pool_price(pool_id)
-                    pool_info['last_price_check'] = current_time
+        except Exception as e:
+            logger.error(f"Error monitoring pool {pool_id}: {e}")
 
-                # Check if we should enter a position
-                if pool_info['status'] == 'monitoring':
-                    await self._check_entry_conditions(pool_id)
+        finally:
+            # Runs on normal exit, timeout, error and cancellation alike
+            self._release_pool(pool_id)
 
-                # Check if we should exit a position
-                elif pool_info['status'] == 'trading':
-                    await self._check_exit_conditions(pool_id)
+    async def _price_loop(self, pool_id: str) -> None:
+        """Check price and entry/exit conditions each time the fetcher publishes a price."""
+        pool_info = self.active_pools[pool_id]
+        price_updated = pool_info.price_updated
 
-                await asyncio.sleep(MONITOR_INTERVAL)
+        while not self.stop_event.is_set() and pool_info.status != 'closed':
+            await price_updated.wait()
+            price_updated.clear()
 
-        except Exception as e:
-            logger.error(f"Error monitoring pool {pool_id}: {e}")
-            await self._stop_monitoring(pool_id)
+            await self._check_pool_price(pool_id)
+
+            # Check if we should enter a position
+            if pool_info.status == 'monitoring':
+                await self._check_entry_conditions(pool_id)
+
+            # Check if we should exit a position
+            elif pool_info.status == 'trading':
+                await self._check_exit_conditions(pool_id)
 
     async def _check_pool_price(self, pool_id: str) -> None:
         """Check current pool price and update status."""
@@ -172,28 +227,30 @@ class PoolMonitor:
                 logger.warning(f"Could not get current price for pool {pool_id}")
                 return
 
-            # Convert to Decimal for calculations
-            current_price = Decimal(str(current_price))
-            entry_price = Decimal(str(pool_info.get('entry_price', current_price)))
+            # Prices are kept as Decimals in PoolState for trading; the
+            # profit math only needs float precision
+            current_price_f = float(current_price)
+            entry_price_f = pool_info.entry_price if pool_info.entry_price is not None else current_price_f
             
             # Calculate profit percentage
-            profit_pct = (current_price - entry_price) / entry_price
+            profit_pct = (current_price_f - entry_price_f) / entry_price_f
             
             # Update consecutive profit updates
             if profit_pct >= PROFIT_THRESHOLD:
-                pool_info['consecutive_profit_updates'] += 1
+                pool_info.consecutive_profit_updates += 1
             else:
-                pool_info['consecutive_profit_updates'] = 0
+                pool_info.consecutive_profit_updates = 0
 
             # Update pool info
-            pool_info['current_price'] = float(current_price)
-            pool_info['profit_pct'] = float(profit_pct)
+            pool_info.current_price_dec = current_price
+            pool_info.current_price = current_price_f
+            pool_info.profit_pct = profit_pct
 
             # Log price update
             logger.info(f"Pool {pool_id} price update:")
             logger.info(f"Current Price: {current_price}")
-            logger.info(f"Profit: {float(profit_pct * 100):.2f}%")
-            logger.info(f"Consecutive Profit Updates: {pool_info['consecutive_profit_updates']}")
+            logger.info(f"Profit: {profit_pct * 100:.2f}%")
+            logger.info(f"Consecutive Profit Updates: {pool_info.consecutive_profit_updates}")
 
         except Exception as e:
             logger.error(f"Error checking pool price: {e}")
@@ -202,16 +259,17 @@ class PoolMonitor:
         """Check if we should enter a position."""
         try:
             pool_info = self.active_pools[pool_id]
-            current_price = Decimal(str(pool_info['current_price']))
+            current_price = pool_info.current_price_dec
             
             # Check if price is stable
-            if pool_info['consecutive_profit_updates'] >= 3:  # 3 consecutive profitable updates
+            if pool_info.consecutive_profit_updates >= 3:  # 3 consecutive profitable updates
                 # Execute buy
                 trade_result = await self._execute_buy(pool_id, current_price)
                 if trade_result and trade_result['status'] == 'confirmed':
-                    pool_info['status'] = 'trading'
-                    pool_info['entry_price'] = float(current_price)
-                    pool_info['entry_timestamp'] = trade_result['timestamp']
+                    pool_info.status = 'trading'
+                    pool_info.entry_price_dec = current_price
+                    pool_info.entry_price = float(current_price)
+                    pool_info.entry_timestamp = trade_result['timestamp']
                     logger.info(f"Entered position for pool {pool_id}")
                     logger.info(f"Entry Price: {current_price}")
                     logger.info(f"Amount: {trade_result['base_amount']}")
@@ -223,11 +281,10 @@ class PoolMonitor:
         """Check if we should exit a position."""
         try:
             pool_info = self.active_pools[pool_id]
-            current_price = Decimal(str(pool_info['current_price']))
-            entry_price = Decimal(str(pool_info['entry_price']))
+            current_price = pool_info.current_price_dec
             
             # Calculate profit percentage
-            profit_pct = (current_price - entry_price) / entry_price
+            profit_pct = (pool_info.current_price - pool_info.entry_price) / pool_info.entry_price
             
             # Check stop loss
             if profit_pct <= STOP_LOSS_THRESHOLD:
@@ -236,7 +293,7 @@ class PoolMonitor:
                 return
 
             # Check take profit
-            if profit_pct >= PROFIT_THRESHOLD and pool_info['consecutive_profit_updates'] >= 3:
+            if profit_pct >= PROFIT_THRESHOLD and pool_info.consecutive_profit_updates >= 3:
                 logger.info(f"Take profit triggered for pool {pool_id}")
                 await self._execute_sell(pool_id, current_price)
                 return
@@ -248,7 +305,7 @@ class PoolMonitor:
         """Execute a buy trade."""
         try:
             pool_info = self.active_pools[pool_id]
-            pool_data = pool_info['data']
+            pool_data = pool_info.data
             
             # Execute paper trade
             trade_result = self.paper_trading.execute_buy(
@@ -258,12 +315,12 @@ class PoolMonitor:
                 price=price,
                 base_decimals=pool_data.get('base_decimals', 9),
                 quote_decimals=pool_data.get('quote_decimals', 9),
-                sol_amount=Decimal(str(TRADE_AMOUNT_SOL))
+                sol_amount=TRADE_AMOUNT_SOL
             )
             
             if trade_result['status'] == 'confirmed':
-                # Store trade in database
-                await self.db.store_trade({
+                # Queue trade and position for the next batched DB write
+                self._queue_write('trade', {
                     'pool_id': pool_id,
                     'trade_type': 'buy',
                     'price': float(price),
@@ -272,13 +329,13 @@ class PoolMonitor:
                     'timestamp': trade_result['timestamp'],
                     'tx_signature': trade_result['tx_signature']
                 })
-                
-                # Store position
-                await self.db.store_position({
+                self._queue_write('position', {
                     'pool_id': pool_id,
+                    'entry_trade_id': trade_result['tx_signature'],
                     'entry_price': float(price),
-                    'entry_amount': trade_result['base_amount'],
-                    'entry_timestamp': trade_result['timestamp'],
+                    'base_amount': trade_result['base_amount'],
+                    'quote_amount': trade_result['quote_amount'],
+                    'opened_at': trade_result['timestamp'],
                     'status': 'open'
                 })
             
@@ -295,23 +352,27 @@ class PoolMonitor:
             trade_result = self.paper_trading.execute_sell(pool_id, price)
             
             if trade_result['status'] == 'confirmed':
-                # Store trade in database
-                await self.db.store_trade({
+                # Queue trade and position close for the next batched DB write
+                self._queue_write('trade', {
                     'pool_id': pool_id,
                     'trade_type': 'sell',
                     'price': float(price),
                     'base_amount': trade_result['base_amount'],
                     'quote_amount': trade_result['quote_amount'],
-                    'pnl': trade_result['pnl'],
                     'timestamp': trade_result['timestamp'],
                     'tx_signature': trade_result['tx_signature']
                 })
+                self._queue_write('position_exit', {
+                    'pool_id': pool_id,
+                    'exit_trade_id': trade_result['tx_signature'],
+                    'exit_price': float(price),
+                    'pnl': trade_result['pnl'],
+                    'status': 'closed',
+                    'closed_at': trade_result['timestamp']
+                })
                 
-                # Update position status
-                await self.db.update_position_status(pool_id, 'closed')
-                
-                # Stop monitoring
-                await self._stop_monitoring(pool_id)
+                # Ends the price loop; _monitor_pool then releases the pool
+                self.active_pools[pool_id].status = 'closed'
             
             return trade_result
 
@@ -319,29 +380,168 @@ class PoolMonitor:
             logger.error(f"Error executing sell for pool {pool_id}: {e}")
             return None
 
+    async def _run_db(self, func, *args):
+        """Run a blocking DatabaseManager call on the DB worker thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._db_executor, func, *args)
+
+    def _queue_write(self, kind: str, row: Dict[str, Any]) -> None:
+        """Buffer a DB write; wake the flusher once the batch is full."""
+        self._pending_writes.append((kind, row))
+        if len(self._pending_writes) >= DB_FLUSH_BATCH_SIZE:
+            self._flush_requested.set()
+
+    async def _flush_writes(self) -> None:
+        """Write all buffered trades and positions in a single transaction off the event loop."""
+        if not self._pending_writes:
+            return
+
+        pending, self._pending_writes = self._pending_writes, []
+        await self._run_db(self._write_batch, pending)
+
+    def _write_batch(self, pending: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store one batch of buffered writes; runs on the DB worker thread."""
+        trades = [row for kind, row in pending if kind == 'trade']
+        positions = [row for kind, row in pending if kind == 'position']
+        position_exits = [row for kind, row in pending if kind == 'position_exit']
+        if not self.db.store_trade_batch(trades, positions, position_exits):
+            logger.error(f"Failed to store {len(pending)} buffered trade/position writes")
+
+    def _ensure_write_flusher(self) -> None:
+        """Start the periodic DB write flusher if it is not already running."""
+        if self.write_flusher_task is None or self.write_flusher_task.done():
+            self.write_flusher_task = asyncio.create_task(self._write_flusher())
+
+    async def _write_flusher(self) -> None:
+        """Flush buffered DB writes every DB_FLUSH_INTERVAL seconds, or sooner once a batch is full."""
+        while not self.stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=DB_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self._flush_writes()
+            except Exception as e:
+                logger.error(f"Error flushing DB writes: {e}")
+
+    def _ensure_price_fetcher(self) -> None:
+        """Start the shared price fetcher if it is not already running."""
+        if self.price_fetcher_task is None or self.price_fetcher_task.done():
+            self.price_fetcher_task = asyncio.create_task(self._price_fetcher())
+
+    async def _price_fetcher(self) -> None:
+        """Refresh prices for all active pools with batched RPC calls."""
+        while not self.stop_event.is_set() and self.active_pools:
+            try:
+                prices = await self._fetch_prices(list(self.active_pools.keys()))
+                for pool_id, price in prices.items():
+                    pool_info = self.active_pools.get(pool_id)
+                    if pool_info is not None:
+                        pool_info.current_price_dec = price
+                        pool_info.price_updated.set()
+
+            except Exception as e:
+                logger.error(f"Error fetching pool prices: {e}")
+
+            await asyncio.sleep(PRICE_CHECK_INTERVAL)
+
+    async def _fetch_prices(self, pool_ids: List[str]) -> Dict[str, Decimal]:
+        """Fetch AMM v4 prices (SOL per token) for many pools in two RPC calls per batch."""
+        prices: Dict[str, Decimal] = {}
+        for i in range(0, len(pool_ids), MAX_POOLS_PER_PRICE_BATCH):
+            batch = []
+            keys = []
+            for pool_id in pool_ids[i:i + MAX_POOLS_PER_PRICE_BATCH]:
+                try:
+                    keys.append(Pubkey.from_string(pool_id))
+                    batch.append(pool_id)
+                except ValueError as e:
+                    logger.warning(f"Skipping price fetch for invalid pool id {pool_id}: {e}")
+            if not keys:
+                continue
+            amm_accounts = await self.rpc_client.get_multiple_accounts(keys, encoding='base64')
+
+            # Decode each account on its own so one bad pool cannot drop the whole tick
+            states = []
+            vaults = []
+            for pool_id, account in zip(batch, amm_accounts.value):
+                if account is None:
+                    continue
+                data = bytes(account.data)
+                if len(data) < AMM_V4_STATE.size:
+                    logger.warning(f"Skipping pool {pool_id}: account is {len(data)} bytes, not an AMM v4 pool")
+                    continue
+                try:
+                    state = AMM_V4_STATE.unpack_from(data)
+                    coin_vault = Pubkey.from_bytes(state[AMM_COIN_VAULT])
+                    pc_vault = Pubkey.from_bytes(state[AMM_PC_VAULT])
+                except (struct.error, ValueError) as e:
+                    logger.warning(f"Skipping pool {pool_id}: could not decode AMM state: {e}")
+                    continue
+                states.append((pool_id, state))
+                vaults.append(coin_vault)
+                vaults.append(pc_vault)
+
+            if not vaults:
+                continue
+            vault_accounts = (await self.rpc_client.get_multiple_accounts(vaults, encoding='base64')).value
+
+            for index, (pool_id, state) in enumerate(states):
+                coin_account = vault_accounts[2 * index]
+                pc_account = vault_accounts[2 * index + 1]
+                if coin_account is None or pc_account is None:
+                    continue
+                try:
+                    coin_amount = TOKEN_ACCOUNT_AMOUNT.unpack_from(bytes(coin_account.data), TOKEN_ACCOUNT_AMOUNT_OFFSET)[0]
+                    pc_amount = TOKEN_ACCOUNT_AMOUNT.unpack_from(bytes(pc_account.data), TOKEN_ACCOUNT_AMOUNT_OFFSET)[0]
+                except struct.error as e:
+                    logger.warning(f"Skipping pool {pool_id}: could not decode vault balances: {e}")
+                    continue
+                coin_reserve = Decimal(coin_amount - state[AMM_NEED_TAKE_PNL_COIN]).scaleb(-state[AMM_COIN_DECIMALS])
+                pc_reserve = Decimal(pc_amount - state[AMM_NEED_TAKE_PNL_PC]).scaleb(-state[AMM_PC_DECIMALS])
+                if coin_reserve <= 0 or pc_reserve <= 0:
+                    continue
+
+                # Quote prices in SOL per token regardless of which side holds WSOL
+                if state[AMM_COIN_MINT] == WSOL_MINT_BYTES:
+                    prices[pool_id] = coin_reserve / pc_reserve
+                else:
+                    prices[pool_id] = pc_reserve / coin_reserve
+
+        return prices
+
     async def _get_current_price(self, pool_id: str) -> Optional[Decimal]:
-        """Get current pool price from RPC."""
+        """Get the latest pool price published by the batched price fetcher."""
         try:
-            # TODO: Implement actual price fetching from RPC
-            # For now, return the last known price
+            # Fall back to the detection price until the fetcher has a quote
             pool_info = self.active_pools[pool_id]
-            return Decimal(str(pool_info.get('current_price', pool_info['data']['price'])))
+            current_price = pool_info.current_price_dec
+            if current_price is None:
+                current_price = Decimal(str(pool_info.data['price']))
+            return current_price
 
         except Exception as e:
             logger.error(f"Error getting current price for pool {pool_id}: {e}")
             return None
 
+    def _release_pool(self, pool_id: str) -> None:
+        """Drop a pool's monitoring state; its queued writes go out with the next flush."""
+        self.monitor_tasks.pop(pool_id, None)
+        if self.active_pools.pop(pool_id, None) is not None:
+            logger.info(f"Stopped monitoring pool {pool_id}")
+
     async def _stop_monitoring(self, pool_id: str) -> None:
-        """Stop monitoring a pool."""
+        """Stop monitoring a pool and wait for its monitor task to finish."""
         try:
-            if pool_id in self.monitor_tasks:
-                self.monitor_tasks[pool_id].cancel()
-                del self.monitor_tasks[pool_id]
-            
-            if pool_id in self.active_pools:
-                del self.active_pools[pool_id]
-            
-            logger.info(f"Stopped monitoring pool {pool_id}")
+            task = self.monitor_tasks.get(pool_id)
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+            self._release_pool(pool_id)
 
         except Exception as e:
             logger.error(f"Error stopping pool monitoring: {e}")
@@ -349,6 +549,15 @@ class PoolMonitor:
     async def stop_all(self) -> None:
         """Stop monitoring all pools."""
         self.stop_event.set()
-        for pool_id in list(self.active_pools.keys()):
-            await self._stop_monitoring(pool_id)
+        if self.price_fetcher_task is not None:
+            self.price_fetcher_task.cancel()
+        if self.write_flusher_task is not None:
+            self.write_flusher_task.cancel()
+        await asyncio.gather(*(self._stop_monitoring(pool_id) for pool_id in list(self.active_pools.keys())))
+        try:
+            await self._flush_writes()
+        except Exception as e:
+            logger.error(f"Error flushing DB writes: {e}")
+        # Wait for the DB worker to drain without blocking the loop
+        await asyncio.to_thread(self._db_executor.shutdown, True)
         logger.info("Stopped monitoring all pools") 
\ No newline at end of file
@@ -1,7 +1,11 @@
 import asyncio
+import atexit
 import json
+import os
+import queue
 import signal
 import sys
+import threading
 from datetime import datetime
 import socketio
 from colorama import init, Fore, Style
@@ -12,6 +16,7 @@ SERVER_URL = 'http://localhost:5001'
 RECONNECT_DELAY = 5  # seconds
 NEW_POOL_COUNT = 0
 MESSAGE_LOG_FILE = 'logs/websocket_messages.log'
+SIO_DEBUG = os.getenv('SIO_DEBUG') == '1'  # per-packet Socket.IO/Engine.IO logging
 
 # Initialize colorama for cross-platform colored terminal output
 init()
@@ -23,8 +28,8 @@ sio = socketio.AsyncClient(
     reconnection_delay=RECONNECT_DELAY,
     reconnection_delay_max=30,  # max delay between reconnection attempts
     randomization_factor=0.5,  # add some randomization to reconnection delays
-    logger=True,  # enable client-side logging for debugging
-    engineio_logger=True,  # enable engine.io logging for debugging
+    logger=SIO_DEBUG,  # client-side logging for debugging (SIO_DEBUG=1)
+    engineio_logger=SIO_DEBUG,  # engine.io logging for debugging (SIO_DEBUG=1)
 )
 
 # Global flag for graceful shutdown
@@ -98,20 +103,58 @@ async def graceful_shutdown():
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
+# Log entries are handed to a writer thread so handlers never block on file I/O
+_log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_LOG_STOP = object()  # queued by stop_log_writer; the writer drains up to it and exits
+_log_writer = None
+
+def _log_writer_thread():
+    """Drain queued log entries into a single long-lived file handle"""
+    try:
+        os.makedirs(os.path.dirname(MESSAGE_LOG_FILE), exist_ok=True)
+        log_file = open(MESSAGE_LOG_FILE, 'a', buffering=64 * 1024)
+    except Exception as e:
+        print(f"{Fore.RED}Error opening log file: {e}{Style.RESET_ALL}")
+        return
+    
+    with log_file:
+        while True:
+            entry = _log_queue.get()
+            if entry is _LOG_STOP:
+                break
+            timestamp, message_type, data = entry
+            try:
+                log_file.write(f"[{timestamp}] {message_type}: {json.dumps(data, separators=(',', ':'))}\n")
+                if _log_queue.empty():
+                    log_file.flush()
+            except Exception as e:
+                print(f"{Fore.RED}Error writing to log file: {e}{Style.RESET_ALL}")
+
+def start_log_writer():
+    """Start the message log writer thread (once)"""
+    global _log_writer
+    if _log_writer is not None:
+        return
+    _log_writer = threading.Thread(target=_log_writer_thread, name="MessageLogWriter", daemon=True)
+    _log_writer.start()
+    # Shutdown paths that exit via sys.exit still drain the log
+    atexit.register(stop_log_writer)
+
+def stop_log_writer():
+    """Write out every queued entry, then flush and close the log file"""
+    global _log_writer
+    if _log_writer is None:
+        return
+    writer, _log_writer = _log_writer, None
+    _log_queue.put_nowait(_LOG_STOP)
+    writer.join()
+
 def log_message(message_type: str, data: dict):
-    """Log message to both console and file"""
+    """Queue a message for the log writer thread"""
     if not running:
         return  # Don't log during shutdown
-        
-    timestamp = datetime.now().isoformat()
-    log_entry = f"[{timestamp}] {message_type}: {json.dumps(data, indent=2)}\n"
     
-    # Log to file
-    try:
-        with open(MESSAGE_LOG_FILE, 'a') as f:
-            f.write(log_entry)
-    except Exception as e:
-        print(f"{Fore.RED}Error writing to log file: {e}{Style.RESET_ALL}")
+    _log_queue.put_nowait((datetime.now().isoformat(), message_type, data))
 
 @sio.event
 async def connect():
@@ -428,6 +471,7 @@ async def main():
     
     print(f"{Fore.CYAN}Starting Raydium Pool Listener...{Style.RESET_ALL}")
     print(f"{Fore.CYAN}Connecting to Socket.IO server at {SERVER_URL}...{Style.RESET_ALL}")
+    start_log_writer()
     
     try:
         await connect_to_server()
@@ -438,6 +482,7 @@ async def main():
     finally:
         if sio.connected:
             await sio.disconnect()
+        await asyncio.to_thread(stop_log_writer)
         print(f"{Fore.GREEN}Listener stopped{Style.RESET_ALL}")
 
 async def check_paper_portfolio():
@@ -6,20 +6,77 @@ Real-time monitoring of Raydium pool events and trading activities
 
 import asyncio
 import json
+import logging
 import signal
 import sys
-from datetime import datetime
+import time
 import socketio
 from colorama import init, Fore, Style
 import aiohttp
+from sio_json import SIO_JSON
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Initialize colorama for cross-platform colored terminal output
 init()
 
+# Resolve the local timezone once; handlers format times with time.localtime
+if hasattr(time, 'tzset'):
+    time.tzset()
+
 # Constants
 SERVER_URL = 'http://localhost:5001'
 RECONNECT_DELAY = 5
 MESSAGE_LOG_FILE = 'logs/websocket_messages.log'
+HEALTH_PRINT_INTERVAL = 300  # Only show health every 5 minutes to reduce noise
+LOOP_MONITOR_INTERVAL = 1.0  # seconds between event loop responsiveness probes
+LOOP_STALL_THRESHOLD = 0.5  # extra delay (seconds) reported as a stall
+
+# Terminal colors, emitted only when stdout is a TTY
+_USE_COLOR = sys.stdout.isatty()
+RED = Fore.RED if _USE_COLOR else ''
+GREEN = Fore.GREEN if _USE_COLOR else ''
+YELLOW = Fore.YELLOW if _USE_COLOR else ''
+CYAN = Fore.CYAN if _USE_COLOR else ''
+MAGENTA = Fore.MAGENTA if _USE_COLOR else ''
+RESET = Style.RESET_ALL if _USE_COLOR else ''
+
+# Console output goes through logging so it can be buffered and level-filtered
+logger = logging.getLogger('bridge')
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter('%(message)s'))
+logger.addHandler(_console_handler)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+# Precomputed terminal decorations for event output
+SEPARATOR = "═" * 80
+GREEN_SEPARATOR = f"{GREEN}{SEPARATOR}{RESET}"
+CYAN_SEPARATOR = f"{CYAN}{SEPARATOR}{RESET}"
+MAGENTA_SEPARATOR = f"{MAGENTA}{SEPARATOR}{RESET}"
+
+def _clock(ts: float) -> str:
+    """Format an epoch timestamp (seconds) as local HH:MM:SS"""
+    return time.strftime('%H:%M:%S', time.localtime(ts))
+
+def _iso_now() -> str:
+    """Local ISO-8601 timestamp with millisecond precision"""
+    now = time.time()
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now))}.{int(now % 1 * 1000):03d}"
+
+def _dumps_log_entry(data) -> bytes:
+    """Compact JSON encoding for the message log"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
 
 # Create Socket.IO client
 sio = socketio.AsyncClient(
@@ -30,184 +87,161 @@ sio = socketio.AsyncClient(
     randomization_factor=0.5,
     logger=False,
     engineio_logger=False,
+    json=SIO_JSON,
 )
 
 # Global state
-running = True
-shutdown_requested = False
+shutdown_event = asyncio.Event()
 stats = {
     'pool_status_6_count': 0,
     'arbitrage_opportunities': 0,
     'paper_trades': 0,
     'health_checks': 0,
-    'last_health_time': 0
+    'last_uptime': 0
 }
 
-def signal_handler(sig, frame):
-    """Handle graceful shutdown"""
-    global running, shutdown_requested
-    
-    if shutdown_requested:
-        print(f"\n{Fore.RED}Force shutting down...{Style.RESET_ALL}")
+def request_shutdown():
+    """Handle graceful shutdown (SIGINT/SIGTERM delivered by the event loop)"""
+    if shutdown_event.is_set():
+        logger.error(f"\n{RED}Force shutting down...{RESET}")
         sys.exit(1)
     
-    shutdown_requested = True
-    print(f"\n{Fore.YELLOW}🛑 Shutdown requested (Ctrl+C)...{Style.RESET_ALL}")
-    running = False
+    logger.warning(f"\n{YELLOW}🛑 Shutdown requested (Ctrl+C)...{RESET}")
+    shutdown_event.set()
+    # Disconnecting releases sio.wait() in connect_to_server
+    asyncio.create_task(sio.disconnect())
 
 async def graceful_shutdown():
     """Perform graceful shutdown operations"""
     try:
         if sio.connected:
-            print(f"{Fore.CYAN}🔌 Disconnecting from Socket.IO server...{Style.RESET_ALL}")
+            logger.info(f"{CYAN}🔌 Disconnecting from Socket.IO server...{RESET}")
             await sio.disconnect()
-            print(f"{Fore.GREEN}✅ Successfully disconnected{Style.RESET_ALL}")
+            logger.info(f"{GREEN}✅ Successfully disconnected{RESET}")
     except Exception as e:
-        print(f"{Fore.RED}❌ Error disconnecting: {e}{Style.RESET_ALL}")
+        logger.error(f"{RED}❌ Error disconnecting: {e}{RESET}")
     
-    print(f"{Fore.GREEN}✅ Shutdown complete{Style.RESET_ALL}")
+    logger.info(f"{GREEN}✅ Shutdown complete{RESET}")
     sys.exit(0)
 
 def log_message(message_type: str, data: dict):
-    """Log message to file"""
-    if not running:
+    """Append a message to the log file (none of this client's handlers call it)"""
+    if shutdown_event.is_set():
         return
-        
-    timestamp = datetime.now().isoformat()
-    log_entry = f"[{timestamp}] {message_type}: {json.dumps(data, indent=2)}\n"
     
     try:
-        with open(MESSAGE_LOG_FILE, 'a') as f:
-            f.write(log_entry)
+        with open(MESSAGE_LOG_FILE, 'ab') as f:
+            f.write(f"[{_iso_now()}] {message_type}: ".encode() + _dumps_log_entry(data) + b"\n")
     except Exception as e:
-        print(f"{Fore.RED}Error writing to log file: {e}{Style.RESET_ALL}")
+        logger.error(f"{RED}Error writing to log file: {e}{RESET}")
 
 def print_header():
     """Print application header"""
-    print(f"{Fore.CYAN}╔════════════════════════════════════════════════════════════════════════════════╗{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}║                    🚀 RAYDIUM POOL LISTENER v2.0 🚀                        ║{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}║                    Real-time Pool Monitoring & Trading                       ║{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}╚════════════════════════════════════════════════════════════════════════════════╝{Style.RESET_ALL}")
+    logger.info(f"{CYAN}╔════════════════════════════════════════════════════════════════════════════════╗{RESET}")
+    logger.info(f"{CYAN}║                    🚀 RAYDIUM POOL LISTENER v2.0 🚀                        ║{RESET}")
+    logger.info(f"{CYAN}║                    Real-time Pool Monitoring & Trading                       ║{RESET}")
+    logger.info(f"{CYAN}╚════════════════════════════════════════════════════════════════════════════════╝{RESET}")
 
 def print_stats():
     """Print current statistics"""
-    print(f"\n{Fore.MAGENTA}📊 STATISTICS:{Style.RESET_ALL}")
-    print(f"{Fore.MAGENTA}   🆕 New Pools Detected: {stats['pool_status_6_count']}{Style.RESET_ALL}")
-    print(f"{Fore.MAGENTA}   🎯 Arbitrage Opportunities: {stats['arbitrage_opportunities']}{Style.RESET_ALL}")
-    print(f"{Fore.MAGENTA}   💰 Paper Trades: {stats['paper_trades']}{Style.RESET_ALL}")
-    print(f"{Fore.MAGENTA}   🏥 Health Checks: {stats['health_checks']}{Style.RESET_ALL}")
+    logger.info(f"\n{MAGENTA}📊 STATISTICS:{RESET}")
+    logger.info(f"{MAGENTA}   🆕 New Pools Detected: {stats['pool_status_6_count']}{RESET}")
+    logger.info(f"{MAGENTA}   🎯 Arbitrage Opportunities: {stats['arbitrage_opportunities']}{RESET}")
+    logger.info(f"{MAGENTA}   💰 Paper Trades: {stats['paper_trades']}{RESET}")
+    logger.info(f"{MAGENTA}   🏥 Health Checks: {stats['health_checks']}{RESET}")
 
 # Socket.IO Event Handlers
 @sio.event
 async def connect():
     """Handle successful connection"""
-    if not running:
-        return
-        
     print_header()
-    print(f"{Fore.GREEN}✅ Connected to Socket.IO server at {SERVER_URL}{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}✅ Client ID: {sio.sid}{Style.RESET_ALL}")
-    print(f"{Fore.GREEN}✅ Transport: {sio.transport()}{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}🎧 Listening for events: pool_status_6, arbitrage_opportunity, paper_trading_update{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}💡 Press Ctrl+C to stop the listener{Style.RESET_ALL}")
+    logger.info(f"{GREEN}✅ Connected to Socket.IO server at {SERVER_URL}{RESET}")
+    logger.info(f"{GREEN}✅ Client ID: {sio.sid}{RESET}")
+    logger.info(f"{GREEN}✅ Transport: {sio.transport()}{RESET}")
+    logger.info(f"{CYAN}🎧 Listening for events: pool_status_6, arbitrage_opportunity, paper_trading_update{RESET}")
+    logger.info(f"{YELLOW}💡 Press Ctrl+C to stop the listener{RESET}")
     
     # Send test connection
     try:
         await sio.emit('test_connection', {
             'client_id': sio.sid,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': _iso_now(),
             'message': 'Python bridge connected and ready'
         })
-        print(f"{Fore.GREEN}✅ Sent test connection message{Style.RESET_ALL}")
+        logger.info(f"{GREEN}✅ Sent test connection message{RESET}")
     except Exception as e:
-        print(f"{Fore.RED}❌ Error sending test message: {e}{Style.RESET_ALL}")
+        logger.error(f"{RED}❌ Error sending test message: {e}{RESET}")
 
 @sio.event
 async def disconnect():
     """Handle disconnection"""
-    if not running:
-        return
-    print(f"{Fore.YELLOW}⚠️  Disconnected from server{Style.RESET_ALL}")
+    logger.warning(f"{YELLOW}⚠️  Disconnected from server{RESET}")
 
 @sio.event
 async def test_response(data):
     """Handle test response from server"""
-    if not running:
-        return
-    print(f"{Fore.GREEN}✅ Server test response: {data.get('message', 'N/A')}{Style.RESET_ALL}")
+    logger.info(f"{GREEN}✅ Server test response: {data.get('message', 'N/A')}{RESET}")
 
 @sio.event
 async def pool_status_6(data):
     """Handle new Status 6 pool events"""
-    if not running:
-        return
-        
     stats['pool_status_6_count'] += 1
     
     try:
-        timestamp = datetime.fromtimestamp(data.get('timestamp', 0) / 1000)
-        formatted_time = timestamp.strftime('%H:%M:%S')
-        
-        print(f"\n{Fore.GREEN}🚀 NEW STATUS 6 POOL DETECTED - {formatted_time}{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}════════════════════════════════════════════════════════════════════════════════{Style.RESET_ALL}")
+        formatted_time = _clock(data.get('timestamp', 0) * 0.001)
         
         pool_id = data.get('pool_id', 'N/A')
         data_obj = data.get('data', {})
-        
-        print(f"{Fore.GREEN}Pool ID: {pool_id[:8]}...{Style.RESET_ALL}")
-        
-        # Token information
         token_a = data_obj.get('token_a', {})
         token_b = data_obj.get('token_b', {})
-        print(f"{Fore.GREEN}Token A: {token_a.get('symbol', 'N/A')} ({token_a.get('mint', 'N/A')[:8]}...){Style.RESET_ALL}")
-        print(f"{Fore.GREEN}Token B: {token_b.get('symbol', 'N/A')} ({token_b.get('mint', 'N/A')[:8]}...){Style.RESET_ALL}")
+        
+        # Build the whole block and write it with a single print
+        lines = [
+            f"\n{GREEN}🚀 NEW STATUS 6 POOL DETECTED - {formatted_time}{RESET}",
+            GREEN_SEPARATOR,
+            f"{GREEN}Pool ID: {pool_id[:8]}...{RESET}",
+            f"{GREEN}Token A: {token_a.get('symbol', 'N/A')} ({token_a.get('mint', 'N/A')[:8]}...){RESET}",
+            f"{GREEN}Token B: {token_b.get('symbol', 'N/A')} ({token_b.get('mint', 'N/A')[:8]}...){RESET}",
+        ]
         
         # Pool timing
         pool_open_time = data_obj.get('pool_open_time', 0)
         if pool_open_time > 0:
-            pool_open_date = datetime.fromtimestamp(pool_open_time)
-            print(f"{Fore.GREEN}Pool Opens: {pool_open_date.strftime('%H:%M:%S')}{Style.RESET_ALL}")
+            lines.append(f"{GREEN}Pool Opens: {_clock(pool_open_time)}{RESET}")
         
         # Trading info
         trade_fee = data_obj.get('trade_fee', 0)
         swap_fee = data_obj.get('swap_fee', 0)
-        print(f"{Fore.YELLOW}Trade Fee: {trade_fee:.3f}% | Swap Fee: {swap_fee:.3f}%{Style.RESET_ALL}")
+        lines.append(f"{YELLOW}Trade Fee: {trade_fee:.3f}% | Swap Fee: {swap_fee:.3f}%{RESET}")
         
         # Detection info
         detected_at = data_obj.get('detected_at', 0)
         if detected_at > 0:
-            detection_time = datetime.fromtimestamp(detected_at/1000)
-            print(f"{Fore.MAGENTA}Detected: {detection_time.strftime('%H:%M:%S.%f')[:-3]}{Style.RESET_ALL}")
+            lines.append(f"{MAGENTA}Detected: {_clock(detected_at * 0.001)}.{int(detected_at) % 1000:03d}{RESET}")
         
-        print(f"{Fore.GREEN}════════════════════════════════════════════════════════════════════════════════{Style.RESET_ALL}")
+        lines.append(GREEN_SEPARATOR)
+        logger.info("\n".join(lines))
         
         # Send acknowledgment
         await sio.emit('pool_status_6_received', {
             'pool_id': pool_id,
-            'received_at': datetime.now().isoformat(),
+            'received_at': _iso_now(),
             'client_id': sio.sid
         })
         
     except Exception as e:
-        print(f"{Fore.RED}Error processing pool_status_6: {e}{Style.RESET_ALL}")
+        logger.error(f"{RED}Error processing pool_status_6: {e}{RESET}")
 
 @sio.event
 async def arbitrage_opportunity(data):
     """Handle arbitrage opportunity events"""
-    if not running:
-        return
-        
     stats['arbitrage_opportunities'] += 1
     
     try:
-        timestamp = datetime.fromtimestamp(data.get('timestamp', 0) / 1000)
-        formatted_time = timestamp.strftime('%H:%M:%S')
+        formatted_time = _clock(data.get('timestamp', 0) * 0.001)
         
         opportunity_data = data.get('data', {})
         
-        print(f"\n{Fore.CYAN}🎯 ARBITRAGE OPPORTUNITY - {formatted_time}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}════════════════════════════════════════════════════════════════════════════════{Style.RESET_ALL}")
-        
         pool_id = data.get('pool_id', 'N/A')
         confidence = opportunity_data.get('confidence', 'N/A')
         entry_price = opportunity_data.get('entryPrice', 0)
@@ -215,31 +249,30 @@ async def arbitrage_opportunity(data):
         price_change = opportunity_data.get('priceChangePercent', 0)
         tvl_change = opportunity_data.get('tvlChangePercent', 0)
         
-        print(f"{Fore.CYAN}Pool: {pool_id[:8]}... | Confidence: {confidence.upper()}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Entry Price: {entry_price:.8f} SOL{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Current Price: {current_price:.8f} SOL{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Price Change: {price_change:+.2f}% | TVL Change: {tvl_change:+.2f}%{Style.RESET_ALL}")
-        
         # Exit strategy
         exit_strategy = opportunity_data.get('exitStrategy', {})
         take_profit = exit_strategy.get('takeProfit', 0)
         stop_loss = exit_strategy.get('stopLoss', 0)
         max_hold_time = exit_strategy.get('maxHoldTime', 0) / 1000 / 60
         
-        print(f"{Fore.YELLOW}Take Profit: {take_profit:.8f} SOL | Stop Loss: {stop_loss:.8f} SOL{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}Max Hold Time: {max_hold_time:.0f} minutes{Style.RESET_ALL}")
-        
-        print(f"{Fore.CYAN}════════════════════════════════════════════════════════════════════════════════{Style.RESET_ALL}")
+        logger.info("\n".join((
+            f"\n{CYAN}🎯 ARBITRAGE OPPORTUNITY - {formatted_time}{RESET}",
+            CYAN_SEPARATOR,
+            f"{CYAN}Pool: {pool_id[:8]}... | Confidence: {confidence.upper()}{RESET}",
+            f"{CYAN}Entry Price: {entry_price:.8f} SOL{RESET}",
+            f"{CYAN}Current Price: {current_price:.8f} SOL{RESET}",
+            f"{CYAN}Price Change: {price_change:+.2f}% | TVL Change: {tvl_change:+.2f}%{RESET}",
+            f"{YELLOW}Take Profit: {take_profit:.8f} SOL | Stop Loss: {stop_loss:.8f} SOL{RESET}",
+            f"{YELLOW}Max Hold Time: {max_hold_time:.0f} minutes{RESET}",
+            CYAN_SEPARATOR,
+        )))
         
     except Exception as e:
-        print(f"{Fore.RED}Error processing arbitrage_opportunity: {e}{Style.RESET_ALL}")
+        logger.error(f"{RED}Error processing arbitrage_opportunity: {e}{RESET}")
 
 @sio.event
 async def paper_trading_update(data):
     """Handle paper trading updates"""
-    if not running:
-        return
-        
     stats['paper_trades'] += 1
     
     try:
@@ -250,108 +283,116 @@ async def paper_trading_update(data):
         pnl = data.get('pnl', 0)
         balance = data.get('balance', 0)
         
-        print(f"\n{Fore.MAGENTA}💰 PAPER TRADING UPDATE{Style.RESET_ALL}")
-        print(f"{Fore.MAGENTA}════════════════════════════════════════════════════════════════════════════════{Style.RESET_ALL}")
-        
-        print(f"{Fore.MAGENTA}Type: {trade_type} | Pool: {pool_id[:8]}...{Style.RESET_ALL}")
-        print(f"{Fore.MAGENTA}Amount: {amount:.4f} SOL | Price: {price:.8f} SOL{Style.RESET_ALL}")
+        lines = [
+            f"\n{MAGENTA}💰 PAPER TRADING UPDATE{RESET}",
+            MAGENTA_SEPARATOR,
+            f"{MAGENTA}Type: {trade_type} | Pool: {pool_id[:8]}...{RESET}",
+            f"{MAGENTA}Amount: {amount:.4f} SOL | Price: {price:.8f} SOL{RESET}",
+        ]
         
         if pnl != 0:
-            pnl_color = Fore.GREEN if pnl > 0 else Fore.RED
-            print(f"{pnl_color}PnL: {pnl:+.4f} SOL{Style.RESET_ALL}")
+            pnl_color = GREEN if pnl > 0 else RED
+            lines.append(f"{pnl_color}PnL: {pnl:+.4f} SOL{RESET}")
         
-        print(f"{Fore.MAGENTA}Portfolio Balance: {balance:.4f} SOL{Style.RESET_ALL}")
-        print(f"{Fore.MAGENTA}════════════════════════════════════════════════════════════════════════════════{Style.RESET_ALL}")
+        lines.append(f"{MAGENTA}Portfolio Balance: {balance:.4f} SOL{RESET}")
+        lines.append(MAGENTA_SEPARATOR)
+        logger.info("\n".join(lines))
         
     except Exception as e:
-        print(f"{Fore.RED}Error processing paper_trading_update: {e}{Style.RESET_ALL}")
+        logger.error(f"{RED}Error processing paper_trading_update: {e}{RESET}")
 
 @sio.event
 async def health(data):
-    """Handle health check events"""
-    if not running:
-        return
-        
+    """Handle health check events (printed periodically by _health_printer_loop)"""
     stats['health_checks'] += 1
-    
-    # Only show health every 5 minutes to reduce noise
-    current_time = datetime.now()
-    if stats['last_health_time'] == 0 or (current_time.timestamp() - stats['last_health_time']) >= 300:
-        uptime = data.get('uptime', 0)
-        hours = int(uptime) // 3600
-        minutes = (int(uptime) % 3600) // 60
+    stats['last_uptime'] = data.get('uptime', 0)
+
+async def _health_printer_loop():
+    """Print the latest health summary every HEALTH_PRINT_INTERVAL seconds"""
+    while not shutdown_event.is_set():
+        try:
+            await asyncio.wait_for(shutdown_event.wait(), timeout=HEALTH_PRINT_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        if shutdown_event.is_set() or stats['health_checks'] == 0:
+            continue
         
-        print(f"\n{Fore.GREEN}🏥 HEALTH CHECK - {current_time.strftime('%H:%M:%S')}{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}   ⏱️  Server uptime: {hours}h {minutes}m{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}   💓 Health messages: {stats['health_checks']}{Style.RESET_ALL}")
-        print_stats()
+        uptime = int(stats['last_uptime'])
+        hours = uptime // 3600
+        minutes = (uptime % 3600) // 60
         
-        stats['last_health_time'] = current_time.timestamp()
+        logger.info(f"\n{GREEN}🏥 HEALTH CHECK - {_clock(time.time())}{RESET}")
+        logger.info(f"{GREEN}   ⏱️  Server uptime: {hours}h {minutes}m{RESET}")
+        logger.info(f"{GREEN}   💓 Health messages: {stats['health_checks']}{RESET}")
+        print_stats()
 
 @sio.event
 async def message(data):
     """Catch-all event handler for debugging"""
-    if not running:
-        return
-    print(f"{Fore.RED}🔍 UNHANDLED EVENT: {data}{Style.RESET_ALL}")
+    logger.error(f"{RED}🔍 UNHANDLED EVENT: {data}{RESET}")
+
+async def _loop_delay_monitor():
+    """Warn when the event loop is blocked long enough to delay event handling"""
+    loop = asyncio.get_running_loop()
+    while not shutdown_event.is_set():
+        t0 = loop.time()
+        await asyncio.sleep(LOOP_MONITOR_INTERVAL)
+        lag = loop.time() - t0 - LOOP_MONITOR_INTERVAL
+        if lag > LOOP_STALL_THRESHOLD:
+            logger.warning(f"{YELLOW}⚠️  Event loop stalled for {lag * 1000:.0f} ms{RESET}")
 
 # Main connection function
 async def connect_to_server():
-    """Connect to the Socket.IO server with retry logic"""
-    global running
-    
-    while running:
+    """Connect to the Socket.IO server with retry logic, then wait for shutdown"""
+    while not shutdown_event.is_set():
         try:
-            if sio.connected:
-                print(f"{Fore.YELLOW}Already connected, maintaining connection...{Style.RESET_ALL}")
-                while running and sio.connected:
-                    await asyncio.sleep(1)
-                if not running:
-                    break
-                continue
-            
-            print(f"{Fore.CYAN}Connecting to Socket.IO server at {SERVER_URL}...{Style.RESET_ALL}")
+            logger.info(f"{CYAN}Connecting to Socket.IO server at {SERVER_URL}...{RESET}")
             await sio.connect(SERVER_URL)
-            
-            while running and sio.connected:
-                await asyncio.sleep(1)
-                
-            if not running:
-                break
+            break
                 
         except Exception as e:
-            if not running:
-                break
-            print(f"{Fore.RED}Connection failed: {e}{Style.RESET_ALL}")
-            print(f"{Fore.YELLOW}Retrying in {RECONNECT_DELAY} seconds...{Style.RESET_ALL}")
-            await asyncio.sleep(RECONNECT_DELAY)
+            logger.error(f"{RED}Connection failed: {e}{RESET}")
+            logger.warning(f"{YELLOW}Retrying in {RECONNECT_DELAY} seconds...{RESET}")
+            try:
+                await asyncio.wait_for(shutdown_event.wait(), RECONNECT_DELAY)
+            except asyncio.TimeoutError:
+                pass
+    
+    # Once connected, socketio's own reconnection keeps the session alive;
+    # sio.wait() returns only after the client disconnects for good
+    if sio.connected:
+        await sio.wait()
 
 async def main():
     """Main function"""
-    global running
+    logger.info(f"{CYAN}Starting Raydium Pool Listener (Clean Version)...{RESET}")
     
-    print(f"{Fore.CYAN}Starting Raydium Pool Listener (Clean Version)...{Style.RESET_ALL}")
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGINT, request_shutdown)
+    loop.add_signal_handler(signal.SIGTERM, request_shutdown)
+    health_printer = asyncio.create_task(_health_printer_loop())
+    loop_monitor = asyncio.create_task(_loop_delay_monitor())
     
     try:
         await connect_to_server()
     except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}Keyboard interrupt received{Style.RESET_ALL}")
+        logger.warning(f"\n{YELLOW}Keyboard interrupt received{RESET}")
     except Exception as e:
-        print(f"{Fore.RED}Unexpected error: {e}{Style.RESET_ALL}")
+        logger.error(f"{RED}Unexpected error: {e}{RESET}")
     finally:
+        health_printer.cancel()
+        loop_monitor.cancel()
         if sio.connected:
             await sio.disconnect()
-        print(f"{Fore.GREEN}Listener stopped{Style.RESET_ALL}")
-
-# Register signal handlers
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
+        logger.info(f"{GREEN}Listener stopped{RESET}")
 
 if __name__ == '__main__':
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}Shutdown complete{Style.RESET_ALL}")
+        logger.info(f"\n{YELLOW}Shutdown complete{RESET}")
     except Exception as e:
-        print(f"{Fore.RED}Fatal error: {e}{Style.RESET_ALL}")
+        logger.error(f"{RED}Fatal error: {e}{RESET}")
         sys.exit(1) 
\ No newline at end of file
@@ -13,7 +13,9 @@ setup(
         "typing-extensions==4.9.0",
         "python-engineio==4.8.0",
         "websockets==12.0",
-        "aiohttp==3.9.3"
+        "aiohttp==3.9.3",
+        "orjson>=3.9",
+        "uvloop>=0.19; platform_system != 'Windows'"
     ],
-    python_requires=">=3.7",
+    python_requires=">=3.10",
 ) 
\ No newline at end of file
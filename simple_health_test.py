@@ -1,13 +1,20 @@
 import asyncio
+import signal
 import socketio
-import json
+import time
 from datetime import datetime
+from sio_json import SIO_JSON
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Create a Socket.IO client
-sio = socketio.AsyncClient()
+sio = socketio.AsyncClient(json=SIO_JSON)
 
 # Track health messages to only show once per minute
-last_health_log_time = 0
+last_health_log_time = 0.0  # time.monotonic() of the last printed health check
 health_message_count = 0
 
 @sio.event
@@ -28,54 +35,66 @@ async def health(data):
     health_message_count += 1
     
     # Only log health messages once per minute
-    current_time = datetime.now()
-    if last_health_log_time == 0 or (current_time - last_health_log_time).seconds >= 60:
+    now = time.monotonic()
+    if last_health_log_time == 0 or now - last_health_log_time >= 60:
         uptime_seconds = data.get('uptime', 0)
         hours = uptime_seconds // 3600
         minutes = (uptime_seconds % 3600) // 60
         
-        print(f"\n🏥 HEALTH CHECK - {current_time.strftime('%H:%M:%S')}")
-        print(f"   ⏱️  Server uptime: {hours}h {minutes}m")
-        print(f"   📨 Messages since last check: {data.get('messages_since_last_check', 0)}")
-        print(f"   📊 Messages per minute: {data.get('messages_per_minute', 0)}")
-        print(f"   👥 Active clients: {data.get('active_clients', 0)}")
-        print(f"   💓 Health messages received: {health_message_count}")
+        print(
+            f"\n🏥 HEALTH CHECK - {datetime.now().strftime('%H:%M:%S')}\n"
+            f"   ⏱️  Server uptime: {hours}h {minutes}m\n"
+            f"   📨 Messages since last check: {data.get('messages_since_last_check', 0)}\n"
+            f"   📊 Messages per minute: {data.get('messages_per_minute', 0)}\n"
+            f"   👥 Active clients: {data.get('active_clients', 0)}\n"
+            f"   💓 Health messages received: {health_message_count}"
+        )
         
-        last_health_log_time = current_time
+        last_health_log_time = now
 
 @sio.event
 async def new_pool(data):
-    print(f"\n🆕 NEW POOL DETECTED!")
-    print(f"   🏊 Pool ID: {data.get('pool_id', 'N/A')}")
-    print(f"   🪙 Token A: {data.get('token_a', 'N/A')}")
-    print(f"   🪙 Token B: {data.get('token_b', 'N/A')}")
-    print(f"   ⏰ Timestamp: {data.get('timestamp', 'N/A')}")
+    print(
+        f"\n🆕 NEW POOL DETECTED!\n"
+        f"   🏊 Pool ID: {data.get('pool_id', 'N/A')}\n"
+        f"   🪙 Token A: {data.get('token_a', 'N/A')}\n"
+        f"   🪙 Token B: {data.get('token_b', 'N/A')}\n"
+        f"   ⏰ Timestamp: {data.get('timestamp', 'N/A')}"
+    )
 
 @sio.event
 async def pool_ready(data):
-    print(f"\n✅ POOL READY!")
-    print(f"   🏊 Pool ID: {data.get('pool_id', 'N/A')}")
-    print(f"   📊 Initial liquidity: {data.get('initial_liquidity', 'N/A')}")
-    print(f"   ⏰ Timestamp: {data.get('timestamp', 'N/A')}")
+    print(
+        f"\n✅ POOL READY!\n"
+        f"   🏊 Pool ID: {data.get('pool_id', 'N/A')}\n"
+        f"   📊 Initial liquidity: {data.get('initial_liquidity', 'N/A')}\n"
+        f"   ⏰ Timestamp: {data.get('timestamp', 'N/A')}"
+    )
 
 @sio.event
 async def pool_update(data):
-    print(f"\n📊 POOL UPDATE!")
-    print(f"   🏊 Pool ID: {data.get('pool_id', 'N/A')}")
-    print(f"   💰 Current liquidity: {data.get('current_liquidity', 'N/A')}")
-    print(f"   📈 Price change: {data.get('price_change', 'N/A')}")
-    print(f"   ⏰ Timestamp: {data.get('timestamp', 'N/A')}")
+    print(
+        f"\n📊 POOL UPDATE!\n"
+        f"   🏊 Pool ID: {data.get('pool_id', 'N/A')}\n"
+        f"   💰 Current liquidity: {data.get('current_liquidity', 'N/A')}\n"
+        f"   📈 Price change: {data.get('price_change', 'N/A')}\n"
+        f"   ⏰ Timestamp: {data.get('timestamp', 'N/A')}"
+    )
 
 async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGINT, stop.set)
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
     try:
         print("🔌 Connecting to Socket.IO server at http://localhost:5001...")
         print("🔌 Connecting to DEFAULT namespace (/) where all events are broadcast...")
         await sio.connect('http://localhost:5001')
         print("✅ Connected! Waiting for events...")
         
-        # Keep running indefinitely
-        while True:
-            await asyncio.sleep(1)
+        # Idle until SIGINT/SIGTERM
+        await stop.wait()
+        print("\n🛑 Shutting down...")
         
     except Exception as e:
         print(f"❌ Connection error: {e}")
@@ -84,6 +103,8 @@ async def main():
             await sio.disconnect()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
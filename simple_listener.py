@@ -6,26 +6,48 @@ import socketio
 import asyncio
 import logging
 import os
+import signal
 import sqlite3
+import threading
+from collections import OrderedDict
 from dotenv import load_dotenv
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from config import SERVER_CONFIG, EVENT_TYPES, DISPLAY_CONFIG
+from db_manager import configure_connection
+from sio_json import SIO_JSON
 
 # --- Minimal DBManager (for writing new pools and trades in live trading mode) ---
 
+INSERT_NEW_POOL_SQL = "INSERT INTO new_pools (pool_id, base_mint, quote_mint, base_decimals, quote_decimals, initial_price, discovery_timestamp, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+INSERT_TRADE_SQL = "INSERT INTO trades (tx_signature, pool_id, base_amount, quote_amount, price, timestamp, status, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+DB_FLUSH_ROWS = 500  # flush once this many rows are buffered...
+DB_FLUSH_INTERVAL = 0.25  # ...or at least this often (seconds)
+
 class DBManager:
     def __init__(self, db_file="trading_history.sqlite"):
         self.db_file = db_file
-        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False, cached_statements=256)
+        configure_connection(self.conn)
         self.cursor = self.conn.cursor()
         self.cursor.execute("CREATE TABLE IF NOT EXISTS new_pools (pool_id TEXT, base_mint TEXT, quote_mint TEXT, base_decimals INTEGER, quote_decimals INTEGER, initial_price REAL, discovery_timestamp INTEGER, status TEXT DEFAULT 'active')")
         self.cursor.execute("CREATE TABLE IF NOT EXISTS trades (tx_signature TEXT, pool_id TEXT, base_amount REAL, quote_amount REAL, price REAL, timestamp INTEGER, status TEXT, error TEXT)")
         self.conn.commit()
+        # Rows are buffered and written with executemany in one transaction per flush
+        self._pool_buf = []
+        self._trade_buf = []
+        # Flushes run on a worker thread (see flush_loop); the lock serialises them
+        self._flush_lock = threading.Lock()
+        self._flush_requested = asyncio.Event()
 
     def store_new_pool(self, pool_data):
         try:
-            self.cursor.execute("INSERT INTO new_pools (pool_id, base_mint, quote_mint, base_decimals, quote_decimals, initial_price, discovery_timestamp, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                               (pool_data["pool_id"], pool_data["base_mint"], pool_data["quote_mint"], pool_data["base_decimals"], pool_data["quote_decimals"], pool_data["initial_price"], pool_data["discovery_timestamp"], pool_data.get("status", "active")))
-            self.conn.commit()
+            self._pool_buf.append((pool_data["pool_id"], pool_data["base_mint"], pool_data["quote_mint"], pool_data["base_decimals"], pool_data["quote_decimals"], pool_data["initial_price"], pool_data["discovery_timestamp"], pool_data.get("status", "active")))
+            self._maybe_flush()
             return True
         except Exception as e:
             logging.error(f"DB error (store_new_pool): {e}")
@@ -33,16 +55,55 @@ class DBManager:
 
     def store_trade(self, trade_data):
         try:
-            self.cursor.execute("INSERT INTO trades (tx_signature, pool_id, base_amount, quote_amount, price, timestamp, status, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                               (trade_data.get("tx_signature", ""), trade_data["pool_id"], trade_data.get("base_amount", 0), trade_data.get("quote_amount", 0), trade_data.get("price", 0), trade_data.get("timestamp", 0), trade_data.get("status", "unknown"), trade_data.get("error", "")))
-            self.conn.commit()
+            self._trade_buf.append((trade_data.get("tx_signature", ""), trade_data["pool_id"], trade_data.get("base_amount", 0), trade_data.get("quote_amount", 0), trade_data.get("price", 0), trade_data.get("timestamp", 0), trade_data.get("status", "unknown"), trade_data.get("error", "")))
+            self._maybe_flush()
             return True
         except Exception as e:
             logging.error(f"DB error (store_trade): {e}")
             return False
 
-    def __del__(self):
-         self.conn.close()
+    def _maybe_flush(self):
+        if len(self._pool_buf) + len(self._trade_buf) >= DB_FLUSH_ROWS:
+            self._flush_requested.set()
+
+    def flush(self):
+        """Write all buffered rows in a single transaction."""
+        with self._flush_lock:
+            if not self._pool_buf and not self._trade_buf:
+                return
+            pools, self._pool_buf = self._pool_buf, []
+            trades, self._trade_buf = self._trade_buf, []
+            try:
+                with self.conn:
+                    if pools:
+                        self.cursor.executemany(INSERT_NEW_POOL_SQL, pools)
+                    if trades:
+                        self.cursor.executemany(INSERT_TRADE_SQL, trades)
+            except Exception as e:
+                logging.error(f"DB error (flush {len(pools)} pools, {len(trades)} trades): {e}")
+
+    async def flush_loop(self):
+        """Flush on a worker thread when the buffer fills or every DB_FLUSH_INTERVAL."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=DB_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            # The commit's fsync happens off the event loop
+            await asyncio.to_thread(self.flush)
+
+    def close(self):
+        """Flush buffered rows, checkpoint the WAL and close the connection."""
+        self.flush()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
 # --- End DBManager ---
 
@@ -57,18 +118,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize Socket.IO client (using default polling upgrade to websocket)
+# Initialize Socket.IO client (transport and path are chosen in sio.connect)
 sio = socketio.AsyncClient(
     logger=False,
     engineio_logger=False,
-    transports=['websocket', 'polling'],
-    engineio_path='/socket.io/',
     reconnection=True,
     reconnection_attempts=5,
     reconnection_delay=1000,
     reconnection_delay_max=5000,
     randomization_factor=0.5,
-    engineio_opts={'eio': 3}  # Force Engine.IO v3 to match server
+    json=SIO_JSON
 )
 
 # --- Minimal (mock) paper trading model ---
@@ -85,6 +144,7 @@ class MockPaperTradingManager:
 
 # Initialize paper trading (or live trading if LIVE_TRADING is set to 1)
 LIVE_TRADING = os.getenv("LIVE_TRADING", "0") == "1"
+INITIAL_BUY_SOL = float(os.getenv("INITIAL_BUY", "0.005"))
 if LIVE_TRADING:
     logger.info("[MODE] Live trading mode enabled (not implemented in this minimal version).")
     buy_func = None  # (Replace with your live buy function if needed)
@@ -97,6 +157,11 @@ else:
 
 # --- Event Handlers ---
 
+# Last price seen per pool from pool_update events, least recently updated
+# first; capped so a long-running listener does not grow it without bound
+LAST_PRICE_MAX_POOLS = 10_000
+_last_price = OrderedDict()
+
 @sio.event
 async def connect():
     """Handle successful connection to the server."""
@@ -123,28 +188,30 @@ async def on_new_pool(data):
     quote_decimals = int(data.get("quoteDecimals", 6))
     initial_price = data.get("initialPrice", 0.0)
     discovery_timestamp = data.get("timestamp", 0) or int(asyncio.get_event_loop().time() * 1000)
-    logger.info("\n==============================")
-    logger.info("🚀 NEW POOL DISCOVERED!")
-    logger.info(f"Pool ID:        {pool_id}")
-    logger.info(f"Base Token:     {base_mint} (decimals: {base_decimals})")
-    logger.info(f"Quote Token:    {quote_mint} (decimals: {quote_decimals})")
-    logger.info(f"Initial Price:  {initial_price}")
-    logger.info("==============================\n")
+    logger.info(
+        "\n==============================\n"
+        "🚀 NEW POOL DISCOVERED!\n"
+        f"Pool ID:        {pool_id}\n"
+        f"Base Token:     {base_mint} (decimals: {base_decimals})\n"
+        f"Quote Token:    {quote_mint} (decimals: {quote_decimals})\n"
+        f"Initial Price:  {initial_price}\n"
+        "==============================\n"
+    )
 
     if LIVE_TRADING and db_manager:
          pool_data = { "pool_id": pool_id, "base_mint": base_mint, "quote_mint": quote_mint, "base_decimals": base_decimals, "quote_decimals": quote_decimals, "initial_price": initial_price, "discovery_timestamp": discovery_timestamp, "status": "active" }
          if db_manager.store_new_pool(pool_data):
-             logger.info("[DB] New pool written to database.")
+             logger.info("[DB] New pool queued for database write.")
          else:
              logger.error("[DB ERROR] Failed to write new pool to database.")
 
     if buy_func:
          try:
-             result = buy_func(pool_id, base_mint, quote_mint, initial_price, base_decimals, quote_decimals, sol_amount=float(os.getenv("INITIAL_BUY", "0.005")))
+             result = buy_func(pool_id, base_mint, quote_mint, initial_price, base_decimals, quote_decimals, sol_amount=INITIAL_BUY_SOL)
              logger.info(f"[TRADE] Paper trade executed. Result: {result}")
              if LIVE_TRADING and db_manager:
                  if db_manager.store_trade(result):
-                     logger.info("[DB] Trade written to database.")
+                     logger.info("[DB] Trade queued for database write.")
                  else:
                      logger.error("[DB ERROR] Failed to write trade to database.")
          except Exception as e:
@@ -156,35 +223,45 @@ async def on_health(data):
 
 @sio.on(EVENT_TYPES["POOL_UPDATE"])
 async def on_pool_update(data):
+    if LIVE_TRADING:
+        return
     pool_id = data.get("poolId")
     current_price = data.get("price")
-    if pool_id and current_price and not LIVE_TRADING:
-         paper_trader.update_position_price(pool_id, current_price)
-         # (update_position_price logs internally if an exit is triggered, so we do not assign its result.)
+    # Skip ticks that repeat the last price seen for this pool
+    if not pool_id or not current_price or _last_price.get(pool_id) == current_price:
+        return
+    _last_price[pool_id] = current_price
+    _last_price.move_to_end(pool_id)
+    if len(_last_price) > LAST_PRICE_MAX_POOLS:
+        _last_price.popitem(last=False)
+    paper_trader.update_position_price(pool_id, current_price)
+    # (update_position_price logs internally if an exit is triggered, so we do not assign its result.)
 
 # --- Main entry point ---
 
 async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGINT, stop.set)
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    flush_task = asyncio.create_task(db_manager.flush_loop()) if db_manager else None
     try:
-        sio.on("connect", connect)
-        sio.on("connect_error", connect_error)
-        sio.on("disconnect", disconnect)
-        sio.on(EVENT_TYPES["NEW_POOL"], on_new_pool)
-        sio.on(EVENT_TYPES["HEALTH"], on_health)
-        sio.on(EVENT_TYPES["POOL_UPDATE"], on_pool_update)
-        logger.info("Connecting to Raydium server (using polling transport)...")
-        await sio.connect(f"http://{SERVER_CONFIG['host']}:{SERVER_CONFIG['port']}", transports=["polling"], wait_timeout=10)
+        logger.info("Connecting to Raydium server (using websocket transport)...")
+        await sio.connect(f"http://{SERVER_CONFIG['host']}:{SERVER_CONFIG['port']}", transports=["websocket"], socketio_path="/socket.io/", wait_timeout=10)
         logger.info("Connection established. Listening for events (including real-time price updates)…")
-        while True:
-            await asyncio.sleep(1)
-    except KeyboardInterrupt:
+        await stop.wait()
         logger.info("👋 Shutdown requested by user. Exiting...")
     except Exception as e:
         logger.error(f"[FATAL ERROR] {e}")
     finally:
+        if flush_task:
+            flush_task.cancel()
+            db_manager.close()
         if sio.connected:
             await sio.disconnect()
         logger.info("Client shutdown complete.")
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main()) 
\ No newline at end of file
@@ -1,23 +1,38 @@
-import requests
-import time
+import asyncio
 import random
 
-def simulate_raydium_activity():
+import aiohttp
+
+SERVER_URL = 'http://localhost:5001/'
+REQUEST_COUNT = 5
+
+async def _request(session, i, delay):
+    """Send one request after its scheduled delay"""
+    await asyncio.sleep(delay)
+    try:
+        # Make a simple request to the server
+        async with session.get(SERVER_URL) as response:
+            print(f"✅ Request {i+1}: {response.status}")
+    except Exception as e:
+        print(f"❌ Request {i+1} failed: {e}")
+
+async def simulate_raydium_activity():
     """Simulate some activity to test health monitoring"""
     print("🔧 Simulating Raydium activity...")
-    
-    # Make some requests to trigger activity
-    for i in range(5):
-        try:
-            # Make a simple request to the server
-            response = requests.get('http://localhost:5001/', timeout=5)
-            print(f"✅ Request {i+1}: {response.status_code}")
-        except Exception as e:
-            print(f"❌ Request {i+1} failed: {e}")
-        
-        time.sleep(random.uniform(1, 3))
-    
+
+    # Stagger requests 1-3s apart, as before, but issue them concurrently
+    # over one keep-alive session so round-trips don't add to the spacing
+    delays = []
+    offset = 0.0
+    for _ in range(REQUEST_COUNT):
+        delays.append(offset)
+        offset += random.uniform(1, 3)
+
+    timeout = aiohttp.ClientTimeout(total=5)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        await asyncio.gather(*(_request(session, i, delay) for i, delay in enumerate(delays)))
+
     print("🎯 Simulation complete!")
 
 if __name__ == "__main__":
-    simulate_raydium_activity() 
\ No newline at end of file
+    asyncio.run(simulate_raydium_activity())
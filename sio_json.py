@@ -0,0 +1,22 @@
+"""
+orjson-backed JSON module for python-socketio clients.
+"""
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonModule:
+    """json-compatible dumps/loads backed by orjson for Socket.IO packet encoding"""
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+# Pass as socketio.AsyncClient(json=SIO_JSON); None keeps socketio's stdlib json
+SIO_JSON = OrjsonModule if orjson is not None else None
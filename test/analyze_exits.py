@@ -1,178 +1,319 @@
 #!/usr/bin/env python3
 import re
 import json
+import mmap
 import os
 from datetime import datetime
-from collections import defaultdict, Counter
+from collections import deque, Counter
 
-def parse_log_file(log_file_path):
-    """Parse the nestjs.log file to extract trading data"""
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Every line parse_log_file cares about, as one bytes alternation dispatched
+# on m.lastgroup. Trade lines are anchored on their "Paper Trade" prefix and
+# numbers use the unambiguous \d+(?:\.\d*)? so a failed match cannot backtrack
+# through the different ways of splitting a digit run.
+_LINE_RE = re.compile(
+    rb'(?P<enter>ENTERED EARLY POSITION(?:: (?P<pool>[A-Za-z0-9]+))?)'
+    rb'|(?P<buy>Paper Trade[^\d\n]*(?P<buy_tok>\d+(?:\.\d*)?) tokens purchased for (?P<buy_sol>\d+(?:\.\d*)?) SOL)'
+    rb'|(?P<exit>FULL EXIT(?:: [A-Za-z0-9]+ \| (?P<reason>[A-Z_]+))?)'
+    rb'|(?P<sell>Paper Trade[^\d\n]*(?P<sell_tok>\d+(?:\.\d*)?) tokens sold for (?P<sell_sol>\d+(?:\.\d*)?) SOL)'
+)
+_RE_TIME = re.compile(rb'\[([^\]]+)\]')
+
+# Analysis history, one JSON object per run (JSON Lines)
+RESULTS_FILE = '../exit_analysis_history.jsonl'
+
+def _dumps_history_entry(data) -> bytes:
+    """Compact JSON encoding for one history line"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode()
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Exit reasons seen so far, interned to small ints so analyze_exits can bucket
+# by list index; _REASONS[i] is the shared str for id i
+_REASON_IDS = {}
+_REASONS = []
+
+def _intern_reason(raw):
+    """Id for the raw exit reason bytes, registering it on first sight"""
+    reason_id = _REASON_IDS.get(raw)
+    if reason_id is None:
+        reason_id = _REASON_IDS[raw] = len(_REASONS)
+        _REASONS.append(raw.decode('ascii'))
+    return reason_id
+
+# Each _LINE_RE alternative contains one of these literals
+_MARKERS = (b'ENTERED EARLY POSITION', b'tokens purchased for', b'FULL EXIT', b'tokens sold for')
+
+def _iter_line_matches(buf, start=0, end=None):
+    """Yield (match, line_start, line_end) for the first _LINE_RE match on each line in buf[start:end].
+
+    bytes.find jumps straight to lines holding a marker, so the regex only runs
+    on those lines instead of over the whole buffer.
+    """
+    if end is None:
+        end = len(buf)
+    next_hit = {marker: buf.find(marker, start, end) for marker in _MARKERS}
+    while True:
+        offset = min((hit for hit in next_hit.values() if hit != -1), default=-1)
+        if offset == -1:
+            return
+        line_start = buf.rfind(b'\n', 0, offset) + 1
+        line_end = buf.find(b'\n', offset, end)
+        if line_end == -1:
+            line_end = end
+        m = _LINE_RE.search(buf, line_start, line_end)
+        if m:
+            yield m, line_start, line_end
+        for marker, hit in next_hit.items():
+            if hit != -1 and hit < line_end:
+                next_hit[marker] = buf.find(marker, line_end, end)
+
+def _line_time(buf, start, end):
+    """First [timestamp] on the line, or None"""
+    time_match = _RE_TIME.search(buf, start, end)
+    return time_match.group(1).decode() if time_match else None
+
+def parse_log_file(log_file_path, start_offset=0):
+    """Parse the nestjs.log file to extract trading data.
+    
+    Parsing begins at start_offset, which must be the start of a line, and
+    stops after the last complete line so a line still being written is left
+    for the next run. Returns the trades and the offset a later run can resume
+    from: the entry line of a trade still open at that point, otherwise the end
+    of the last complete line.
+    """
     trades = []
     current_trade = {}
+    entry_line_start = 0
     
-    with open(log_file_path, 'r') as f:
-        for line in f:
-            # Look for position entries
-            if "ENTERED EARLY POSITION" in line:
-                if current_trade:
-                    trades.append(current_trade)
-                current_trade = {
-                    'entry_time': None,
-                    'entry_amount': None,
-                    'entry_tokens': None,
-                    'pool_id': None,
-                    'exit_time': None,
-                    'exit_amount': None,
-                    'exit_tokens': None,
-                    'exit_reason': None,
-                    'pnl': None
-                }
+    with open(log_file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return trades, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b'\n') + 1
+            for m, line_start, line_end in _iter_line_matches(mm, start_offset, end):
+                kind = m.lastgroup
                 
-                # Extract pool ID
-                pool_match = re.search(r'ENTERED EARLY POSITION: ([A-Za-z0-9]+)', line)
-                if pool_match:
-                    current_trade['pool_id'] = pool_match.group(1)
+                # Look for position entries
+                if kind == 'enter':
+                    if current_trade:
+                        trades.append(current_trade)
+                    entry_line_start = line_start
+                    pool_id = m.group('pool')
+                    current_trade = {
+                        'entry_time': _line_time(mm, line_start, line_end),
+                        'entry_amount': None,
+                        'entry_tokens': None,
+                        'pool_id': pool_id.decode('ascii') if pool_id else None,
+                        'exit_time': None,
+                        'exit_amount': None,
+                        'exit_tokens': None,
+                        'exit_reason': None,
+                        'exit_reason_id': None,
+                        'pnl': None
+                    }
                 
-                # Extract timestamp
-                time_match = re.search(r'\[([^\]]+)\]', line)
-                if time_match:
-                    current_trade['entry_time'] = time_match.group(1)
-            
-            # Look for entry trade details
-            elif "Paper Trade" in line and "tokens purchased for" in line:
-                match = re.search(r'(\d+\.?\d*) tokens purchased for (\d+\.?\d*) SOL', line)
-                if match and current_trade:
-                    current_trade['entry_tokens'] = float(match.group(1))
-                    current_trade['entry_amount'] = float(match.group(2))
-            
-            # Look for exit reasons
-            elif "FULL EXIT" in line:
-                if current_trade:
-                    # Extract exit reason
-                    exit_match = re.search(r'FULL EXIT: [A-Za-z0-9]+ \| ([A-Z_]+)', line)
-                    if exit_match:
-                        current_trade['exit_reason'] = exit_match.group(1)
-                    
-                    # Extract timestamp
-                    time_match = re.search(r'\[([^\]]+)\]', line)
-                    if time_match:
-                        current_trade['exit_time'] = time_match.group(1)
-            
-            # Look for exit trade details
-            elif "Paper Trade" in line and "tokens sold for" in line:
-                match = re.search(r'(\d+\.?\d*) tokens sold for (\d+\.?\d*) SOL', line)
-                if match and current_trade:
-                    current_trade['exit_tokens'] = float(match.group(1))
-                    current_trade['exit_amount'] = float(match.group(2))
-                    
-                    # Calculate PnL
-                    if current_trade['entry_amount'] and current_trade['exit_amount']:
-                        current_trade['pnl'] = current_trade['exit_amount'] - current_trade['entry_amount']
-                        current_trade['pnl_percent'] = (current_trade['pnl'] / current_trade['entry_amount']) * 100
-                    
-                    # Add to trades list
-                    trades.append(current_trade)
-                    current_trade = {}
+                # Look for entry trade details
+                elif kind == 'buy':
+                    if current_trade:
+                        current_trade['entry_tokens'] = float(m.group('buy_tok'))
+                        current_trade['entry_amount'] = float(m.group('buy_sol'))
+                
+                # Look for exit reasons
+                elif kind == 'exit':
+                    if current_trade:
+                        if m.group('reason'):
+                            reason_id = _intern_reason(m.group('reason'))
+                            current_trade['exit_reason_id'] = reason_id
+                            current_trade['exit_reason'] = _REASONS[reason_id]
+                        
+                        exit_time = _line_time(mm, line_start, line_end)
+                        if exit_time:
+                            current_trade['exit_time'] = exit_time
+                
+                # Look for exit trade details
+                elif kind == 'sell':
+                    if current_trade:
+                        current_trade['exit_tokens'] = float(m.group('sell_tok'))
+                        current_trade['exit_amount'] = float(m.group('sell_sol'))
+                        
+                        # Calculate PnL
+                        if current_trade['entry_amount'] and current_trade['exit_amount']:
+                            current_trade['pnl'] = current_trade['exit_amount'] - current_trade['entry_amount']
+                            current_trade['pnl_percent'] = (current_trade['pnl'] / current_trade['entry_amount']) * 100
+                        
+                        # Add to trades list
+                        trades.append(current_trade)
+                        current_trade = {}
     
-    return trades
+    return trades, entry_line_start if current_trade else end
+
+def _exit_type_stats(count, total_pnl, percent_total, profitable_count, losing_count, min_pnl, max_pnl, total_trades):
+    """Results entry for one exit type from its additive totals"""
+    return {
+        'count': count,
+        'percentage': (count / total_trades) * 100,
+        'avg_pnl': total_pnl / count,
+        'avg_pnl_percent': percent_total / count,
+        'total_pnl': total_pnl,
+        'profitable_count': profitable_count,
+        'losing_count': losing_count,
+        'success_rate': (profitable_count / count) * 100,
+        'min_pnl': min_pnl,
+        'max_pnl': max_pnl
+    }
+
+def _overall_stats(total_pnl, total, profitable_count, losing_count, best, worst):
+    """overall_performance entry from additive totals"""
+    return {
+        'total_pnl': total_pnl,
+        'avg_pnl_per_trade': total_pnl / total,
+        'overall_success_rate': (profitable_count / total) * 100,
+        'best_single_trade': best,
+        'worst_single_trade': worst,
+        'profitable_trades': profitable_count,
+        'losing_trades': losing_count,
+        'total_trades': total
+    }
 
 def analyze_exits(trades):
     """Analyze exit patterns and calculate statistics"""
-    exit_stats = defaultdict(list)
-    exit_counts = Counter()
+    all_pnls = []
+    reason_ids = []
+    pnl_percents = []
     
+    # Single pass over the trades collecting flat columns for both the overall
+    # and the per-exit-type stats; -1 marks trades without an exit reason
     for trade in trades:
-        if trade.get('exit_reason') and trade.get('pnl') is not None:
-            exit_reason = trade['exit_reason']
-            exit_stats[exit_reason].append(trade)
-            exit_counts[exit_reason] += 1
+        pnl = trade.get('pnl')
+        if pnl is None:
+            continue
+        all_pnls.append(pnl)
+        reason_id = trade.get('exit_reason_id')
+        reason_ids.append(-1 if reason_id is None else reason_id)
+        pnl_percents.append(trade['pnl_percent'])
+    
+    all_pnls = np.asarray(all_pnls, dtype=np.float64)
+    reason_ids = np.asarray(reason_ids, dtype=np.intp)
+    has_reason = reason_ids >= 0
     
-    # Calculate statistics for each exit type
+    # Grouped reductions over every exit type at once, indexed by reason id
+    ids = reason_ids[has_reason]
+    pnls = all_pnls[has_reason]
+    num_reasons = len(_REASONS)
+    counts = np.bincount(ids, minlength=num_reasons)
+    totals = np.bincount(ids, weights=pnls, minlength=num_reasons)
+    percent_totals = np.bincount(ids, weights=np.asarray(pnl_percents, dtype=np.float64)[has_reason], minlength=num_reasons)
+    profitable_counts = np.bincount(ids[pnls > 0], minlength=num_reasons)
+    losing_counts = np.bincount(ids[pnls < 0], minlength=num_reasons)
+    min_pnls = np.full(num_reasons, np.inf)
+    max_pnls = np.full(num_reasons, -np.inf)
+    np.minimum.at(min_pnls, ids, pnls)
+    np.maximum.at(max_pnls, ids, pnls)
+    
+    total_trades = int(ids.size)
+    exit_counts = Counter()
     results = {}
-    total_trades = len([t for t in trades if t.get('exit_reason') and t.get('pnl') is not None])
     
-    for exit_type, trade_list in exit_stats.items():
-        pnls = [t['pnl'] for t in trade_list]
-        pnl_percents = [t['pnl_percent'] for t in trade_list]
-        
-        profitable_trades = [p for p in pnls if p > 0]
-        losing_trades = [p for p in pnls if p < 0]
-        
-        results[exit_type] = {
-            'count': len(trade_list),
-            'percentage': (len(trade_list) / total_trades) * 100,
-            'avg_pnl': sum(pnls) / len(pnls),
-            'avg_pnl_percent': sum(pnl_percents) / len(pnl_percents),
-            'total_pnl': sum(pnls),
-            'profitable_count': len(profitable_trades),
-            'losing_count': len(losing_trades),
-            'success_rate': (len(profitable_trades) / len(trade_list)) * 100 if trade_list else 0,
-            'max_profit': max(pnls) if pnls else 0,
-            'max_loss': min(pnls) if pnls else 0,
-            'min_pnl': min(pnls) if pnls else 0,
-            'max_pnl': max(pnls) if pnls else 0
-        }
+    for reason_id in np.flatnonzero(counts):
+        exit_type = _REASONS[reason_id]
+        exit_counts[exit_type] = int(counts[reason_id])
+        results[exit_type] = _exit_type_stats(
+            int(counts[reason_id]),
+            float(totals[reason_id]),
+            float(percent_totals[reason_id]),
+            int(profitable_counts[reason_id]),
+            int(losing_counts[reason_id]),
+            float(min_pnls[reason_id]),
+            float(max_pnls[reason_id]),
+            total_trades
+        )
+    
+    # Overall statistics across every trade with a PnL
+    overall_stats = {}
+    if all_pnls.size:
+        overall_stats = _overall_stats(
+            float(all_pnls.sum()),
+            int(all_pnls.size),
+            int((all_pnls > 0).sum()),
+            int((all_pnls < 0).sum()),
+            float(all_pnls.max()),
+            float(all_pnls.min())
+        )
     
-    return results, exit_counts, total_trades
+    return results, exit_counts, total_trades, overall_stats
 
-def save_results_to_json(results, exit_counts, total_trades, trades):
-    """Save analysis results to JSON file with timestamp"""
-    timestamp = datetime.now().isoformat()
+def merge_analysis(previous, results, exit_counts, total_trades, overall_stats):
+    """Fold stats for newly parsed trades into a previous run's history record"""
+    totals = {}
+    for stats in (previous['exit_type_stats'], results):
+        for exit_type, entry in stats.items():
+            row = [entry['count'], entry['total_pnl'], entry['avg_pnl_percent'] * entry['count'],
+                   entry['profitable_count'], entry['losing_count'], entry['min_pnl'], entry['max_pnl']]
+            merged = totals.setdefault(exit_type, row)
+            if merged is not row:
+                for i in range(5):
+                    merged[i] += row[i]
+                merged[5] = min(merged[5], row[5])
+                merged[6] = max(merged[6], row[6])
     
-    # Calculate overall statistics
-    all_pnls = []
-    for trade in trades:
-        if trade.get('pnl') is not None:
-            all_pnls.append(trade['pnl'])
+    merged_total = previous['total_completed_trades'] + total_trades
+    merged_results = {exit_type: _exit_type_stats(*row, merged_total) for exit_type, row in totals.items()}
+    merged_counts = Counter({exit_type: entry['count'] for exit_type, entry in merged_results.items()})
     
-    overall_stats = {}
-    if all_pnls:
-        profitable_trades = [p for p in all_pnls if p > 0]
-        losing_trades = [p for p in all_pnls if p < 0]
-        
-        overall_stats = {
-            'total_pnl': sum(all_pnls),
-            'avg_pnl_per_trade': sum(all_pnls) / len(all_pnls),
-            'overall_success_rate': (len(profitable_trades) / len(all_pnls)) * 100,
-            'best_single_trade': max(all_pnls),
-            'worst_single_trade': min(all_pnls),
-            'profitable_trades': len(profitable_trades),
-            'losing_trades': len(losing_trades),
-            'total_trades': len(all_pnls)
-        }
+    previous_overall = previous['overall_performance']
+    merged_overall = overall_stats or previous_overall
+    if previous_overall and overall_stats:
+        merged_overall = _overall_stats(
+            previous_overall['total_pnl'] + overall_stats['total_pnl'],
+            previous_overall['total_trades'] + overall_stats['total_trades'],
+            previous_overall['profitable_trades'] + overall_stats['profitable_trades'],
+            previous_overall['losing_trades'] + overall_stats['losing_trades'],
+            max(previous_overall['best_single_trade'], overall_stats['best_single_trade']),
+            min(previous_overall['worst_single_trade'], overall_stats['worst_single_trade'])
+        )
+    
+    return merged_results, merged_counts, merged_total, merged_overall
+
+def _load_last_run():
+    """Most recent history record, or None"""
+    if not os.path.exists(RESULTS_FILE):
+        return None
+    with open(RESULTS_FILE, 'rb') as f:
+        last = deque(f, maxlen=1)
+    return _loads(last[0]) if last else None
+
+def save_results_to_json(results, exit_counts, total_trades, overall_stats, raw_trades_count, log_cursor):
+    """Save analysis results to JSON file with timestamp"""
+    now = datetime.now()
     
     # Create the complete analysis result
     analysis_result = {
-        'timestamp': timestamp,
-        'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'timestamp': now.isoformat(),
+        'analysis_date': now.strftime('%Y-%m-%d %H:%M:%S'),
         'total_completed_trades': total_trades,
         'exit_types_found': len(results),
         'exit_type_breakdown': dict(exit_counts),
         'exit_type_stats': results,
         'overall_performance': overall_stats,
-        'raw_trades_count': len(trades)
+        'raw_trades_count': raw_trades_count,
+        'log_cursor': log_cursor
     }
     
-    # Load existing results or create new file
-    results_file = '../exit_analysis_history.json'
-    existing_results = []
-    
-    if os.path.exists(results_file):
-        try:
-            with open(results_file, 'r') as f:
-                existing_results = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            existing_results = []
-    
-    # Append new result
-    existing_results.append(analysis_result)
+    # Append as one JSON line; earlier runs are never re-read or rewritten
+    with open(RESULTS_FILE, 'ab') as f:
+        f.write(_dumps_history_entry(analysis_result) + b'\n')
     
-    # Save back to file
-    with open(results_file, 'w') as f:
-        json.dump(existing_results, f, indent=2)
-    
-    print(f"💾 Results saved to {results_file}")
-    print(f"📊 Total analysis runs: {len(existing_results)}")
+    print(f"💾 Results saved to {RESULTS_FILE}")
     
     return analysis_result
 
@@ -187,12 +328,37 @@ def main():
         print("💡 Make sure you're running from the test folder and logs exist in ../logs/")
         return
     
-    trades = parse_log_file(log_file_path)
+    # Resume from the previous run's cursor when the log has only been appended
+    # to since; a shrunk or replaced file is parsed from the start
+    log_stat = os.stat(log_file_path)
+    previous = _load_last_run()
+    cursor = previous.get('log_cursor') if previous else None
+    if not cursor or cursor['inode'] != log_stat.st_ino or log_stat.st_size < cursor['size']:
+        previous = None
     
-    print(f"📊 Raw trades found: {len(trades)}")
+    if previous and log_stat.st_size == cursor['size'] and log_stat.st_mtime_ns == cursor['mtime_ns']:
+        print("📎 Log unchanged since the last run")
+        trades, resume_offset = [], cursor['offset']
+    elif previous:
+        print(f"📎 Parsing {log_stat.st_size - cursor['offset']} new bytes since the last run")
+        trades, resume_offset = parse_log_file(log_file_path, cursor['offset'])
+    else:
+        trades, resume_offset = parse_log_file(log_file_path)
     
     # Analyze exits
-    results, exit_counts, total_trades = analyze_exits(trades)
+    results, exit_counts, total_trades, overall_stats = analyze_exits(trades)
+    raw_trades_count = len(trades)
+    if previous:
+        results, exit_counts, total_trades, overall_stats = merge_analysis(previous, results, exit_counts, total_trades, overall_stats)
+        raw_trades_count += previous['raw_trades_count']
+    log_cursor = {
+        'inode': log_stat.st_ino,
+        'size': log_stat.st_size,
+        'mtime_ns': log_stat.st_mtime_ns,
+        'offset': resume_offset
+    }
+    
+    print(f"📊 Raw trades found: {raw_trades_count}")
     
     print(f"📊 Total Completed Trades: {total_trades}")
     print(f"📈 Total Exit Types Found: {len(results)}")
@@ -206,30 +372,22 @@ def main():
         print(f"   📈 Total PnL: {stats['total_pnl']:+.4f} SOL")
         print(f"   ✅ Success Rate: {stats['success_rate']:.1f}% ({stats['profitable_count']}/{stats['count']})")
         print(f"   📊 Profit Range: {stats['min_pnl']:+.4f} to {stats['max_pnl']:+.4f} SOL")
-        print(f"   🎯 Best Trade: {stats['max_profit']:+.4f} SOL")
-        print(f"   📉 Worst Trade: {stats['max_loss']:+.4f} SOL")
+        print(f"   🎯 Best Trade: {stats['max_pnl']:+.4f} SOL")
+        print(f"   📉 Worst Trade: {stats['min_pnl']:+.4f} SOL")
     
     # Summary statistics
     print("\n" + "=" * 80)
     print("📋 SUMMARY STATISTICS:")
     print("=" * 80)
     
-    all_pnls = []
-    for trade in trades:
-        if trade.get('pnl') is not None:
-            all_pnls.append(trade['pnl'])
-    
-    if all_pnls:
-        profitable_trades = [p for p in all_pnls if p > 0]
-        losing_trades = [p for p in all_pnls if p < 0]
-        
+    if overall_stats:
         print(f"💰 Overall Performance:")
-        print(f"   📊 Total PnL: {sum(all_pnls):+.4f} SOL")
-        print(f"   📈 Average PnL per Trade: {sum(all_pnls)/len(all_pnls):+.4f} SOL")
-        print(f"   ✅ Overall Success Rate: {(len(profitable_trades)/len(all_pnls)*100):.1f}%")
-        print(f"   🎯 Best Single Trade: {max(all_pnls):+.4f} SOL")
-        print(f"   📉 Worst Single Trade: {min(all_pnls):+.4f} SOL")
-        print(f"   📊 Profit Distribution: {len(profitable_trades)} profitable, {len(losing_trades)} losing")
+        print(f"   📊 Total PnL: {overall_stats['total_pnl']:+.4f} SOL")
+        print(f"   📈 Average PnL per Trade: {overall_stats['avg_pnl_per_trade']:+.4f} SOL")
+        print(f"   ✅ Overall Success Rate: {overall_stats['overall_success_rate']:.1f}%")
+        print(f"   🎯 Best Single Trade: {overall_stats['best_single_trade']:+.4f} SOL")
+        print(f"   📉 Worst Single Trade: {overall_stats['worst_single_trade']:+.4f} SOL")
+        print(f"   📊 Profit Distribution: {overall_stats['profitable_trades']} profitable, {overall_stats['losing_trades']} losing")
     
     # Exit type breakdown
     print(f"\n🎯 Exit Type Breakdown:")
@@ -239,14 +397,14 @@ def main():
     
     # Save results to JSON
     print("\n" + "=" * 80)
-    analysis_result = save_results_to_json(results, exit_counts, total_trades, trades)
+    analysis_result = save_results_to_json(results, exit_counts, total_trades, overall_stats, raw_trades_count, log_cursor)
     
     # Show comparison with previous runs if available
-    results_file = '../exit_analysis_history.json'
-    if os.path.exists(results_file):
+    if os.path.exists(RESULTS_FILE):
         try:
-            with open(results_file, 'r') as f:
-                history = json.load(f)
+            # Only the last two runs are needed; earlier lines are skipped unparsed
+            with open(RESULTS_FILE, 'rb') as f:
+                history = [_loads(line) for line in deque(f, maxlen=2)]
             
             if len(history) > 1:
                 print(f"\n📈 PERFORMANCE COMPARISON:")
@@ -1,49 +1,88 @@
 #!/usr/bin/env python3
-import re
 import json
+import mmap
+import os
+from dataclasses import dataclass
+from typing import List, Optional
 
-def parse_log_file(log_file_path):
-    trades = []
+import numpy as np
+
+# Same log line grammar and marker scan as the exit analysis
+from analyze_exits import _iter_line_matches
+
+def _iter_trades(buf):
+    """Yield each trade parsed from the log buffer as a short-lived dict"""
     current_trade = {}
-    
-    with open(log_file_path, 'r') as f:
-        for line in f:
-            if 'ENTERED EARLY POSITION' in line:
-                if current_trade:
-                    trades.append(current_trade)
-                current_trade = {
-                    'entry_amount': None,
-                    'exit_reason': None,
-                    'pnl': None
-                }
-                
-                pool_match = re.search(r'ENTERED EARLY POSITION: ([A-Za-z0-9]+)', line)
-                if pool_match:
-                    current_trade['pool_id'] = pool_match.group(1)
-            
-            elif 'Paper Trade' in line and 'tokens purchased for' in line:
-                match = re.search(r'(\d+\.?\d*) tokens purchased for (\d+\.?\d*) SOL', line)
-                if match and current_trade:
-                    current_trade['entry_amount'] = float(match.group(2))
+    for m, _, _ in _iter_line_matches(buf):
+        kind = m.lastgroup
+        
+        if kind == 'enter':
+            if current_trade:
+                yield current_trade
+            current_trade = {
+                'entry_amount': None,
+                'exit_reason': None,
+                'pnl': None
+            }
             
-            elif 'FULL EXIT' in line:
-                if current_trade:
-                    exit_match = re.search(r'FULL EXIT: [A-Za-z0-9]+ \| ([A-Z_]+)', line)
-                    if exit_match:
-                        current_trade['exit_reason'] = exit_match.group(1)
-            
-            elif 'Paper Trade' in line and 'tokens sold for' in line:
-                match = re.search(r'(\d+\.?\d*) tokens sold for (\d+\.?\d*) SOL', line)
-                if match and current_trade:
-                    current_trade['exit_amount'] = float(match.group(2))
-                    
-                    if current_trade['entry_amount'] and current_trade['exit_amount']:
-                        current_trade['pnl'] = current_trade['exit_amount'] - current_trade['entry_amount']
-                    
-                    trades.append(current_trade)
-                    current_trade = {}
+            if m.group('pool'):
+                current_trade['pool_id'] = m.group('pool').decode('ascii')
+        
+        elif kind == 'buy':
+            if current_trade:
+                current_trade['entry_amount'] = float(m.group('buy_sol'))
+        
+        elif kind == 'exit':
+            if current_trade and m.group('reason'):
+                current_trade['exit_reason'] = m.group('reason').decode('ascii')
+        
+        elif kind == 'sell':
+            if current_trade:
+                current_trade['exit_amount'] = float(m.group('sell_sol'))
+                
+                if current_trade['entry_amount'] and current_trade['exit_amount']:
+                    current_trade['pnl'] = current_trade['exit_amount'] - current_trade['entry_amount']
+                
+                yield current_trade
+                current_trade = {}
+
+@dataclass(slots=True)
+class Trades:
+    """Parsed trades stored column-wise; missing amounts and PnL are NaN"""
+    pool_id: List[Optional[str]]
+    entry_amount: np.ndarray
+    exit_amount: np.ndarray
+    pnl: np.ndarray
+    exit_reason_id: np.ndarray  # int32 index into reasons, -1 when no exit was logged
+    reasons: List[str]
+
+    def __len__(self):
+        return len(self.pool_id)
+
+def parse_log_file(log_file_path):
+    pool_ids, entry_amounts, exit_amounts, pnls, reason_ids = [], [], [], [], []
+    reasons = {}
+    
+    with open(log_file_path, 'rb') as f:
+        # mmap rejects empty files
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for trade in _iter_trades(mm):
+                    pool_ids.append(trade.get('pool_id'))
+                    entry_amounts.append(trade['entry_amount'] or np.nan)
+                    exit_amounts.append(trade.get('exit_amount') or np.nan)
+                    pnls.append(np.nan if trade['pnl'] is None else trade['pnl'])
+                    reason = trade['exit_reason']
+                    reason_ids.append(-1 if reason is None else reasons.setdefault(reason, len(reasons)))
     
-    return trades
+    return Trades(
+        pool_id=pool_ids,
+        entry_amount=np.asarray(entry_amounts, dtype=np.float64),
+        exit_amount=np.asarray(exit_amounts, dtype=np.float64),
+        pnl=np.asarray(pnls, dtype=np.float64),
+        exit_reason_id=np.asarray(reason_ids, dtype=np.int32),
+        reasons=list(reasons)
+    )
 
 def main():
     print("🛑 STOP LOSS WORST CASE ANALYSIS")
@@ -52,11 +91,14 @@ def main():
     trades = parse_log_file('../logs/nestjs.log')
     
     # Filter stop loss trades
-    stop_loss_trades = [t for t in trades if t.get('exit_reason') in ['STOP_LOSS', 'TRAILING_STOP_LOSS'] and t.get('entry_amount')]
+    stop_ids = [trades.reasons.index(r) for r in ('STOP_LOSS', 'TRAILING_STOP_LOSS') if r in trades.reasons]
+    entry_amount = np.nan_to_num(trades.entry_amount)
+    mask = np.isin(trades.exit_reason_id, stop_ids) & (entry_amount != 0)
+    stop_idx = np.flatnonzero(mask)
     
-    total_stop_trades = len(stop_loss_trades)
-    total_entry_amount = sum(t['entry_amount'] for t in stop_loss_trades)
-    total_pnl = sum(t['pnl'] for t in stop_loss_trades if t.get('pnl') is not None)
+    total_stop_trades = len(stop_idx)
+    total_entry_amount = float(entry_amount[mask].sum())
+    total_pnl = float(np.nansum(trades.pnl[mask]))
     
     print(f'📊 Total Stop Loss Trades: {total_stop_trades}')
     print(f'💰 Total Entry Amount: {total_entry_amount:.4f} SOL')
@@ -66,11 +108,11 @@ def main():
     print('📋 INDIVIDUAL STOP LOSS TRADES:')
     print('-' * 60)
     
-    for i, trade in enumerate(stop_loss_trades, 1):
-        entry = trade.get('entry_amount', 0)
-        pnl = trade.get('pnl', 0)
-        exit_reason = trade.get('exit_reason', 'UNKNOWN')
-        pool_id = trade.get('pool_id', 'N/A')[:8]
+    for i, idx in enumerate(stop_idx, 1):
+        entry = entry_amount[idx]
+        pnl = trades.pnl[idx]
+        exit_reason = trades.reasons[trades.exit_reason_id[idx]]
+        pool_id = (trades.pool_id[idx] or 'N/A')[:8]
         print(f'  {i:2d}. {exit_reason:20s} | Pool: {pool_id}... | Entry: {entry:.1f} SOL | PnL: {pnl:+.4f} SOL')
     
     print()
@@ -78,12 +120,8 @@ def main():
     print('-' * 60)
     
     # Count position sizes
-    position_sizes = {}
-    for trade in stop_loss_trades:
-        size = trade['entry_amount']
-        position_sizes[size] = position_sizes.get(size, 0) + 1
-    
-    for size, count in sorted(position_sizes.items()):
+    sizes, counts = np.unique(entry_amount[mask], return_counts=True)
+    for size, count in zip(sizes, counts):
         print(f'  {size:.1f} SOL positions: {count} trades')
     
     print()
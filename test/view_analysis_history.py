@@ -3,17 +3,29 @@ import json
 import os
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Written by analyze_exits.py, one JSON object per run (JSON Lines)
+RESULTS_FILE = '../exit_analysis_history.jsonl'
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+def load_history():
+    """Read every analysis run from the history file"""
+    with open(RESULTS_FILE, 'rb') as f:
+        return [_loads(line) for line in f.read().splitlines() if line.strip()]
+
 def view_analysis_history():
     """View historical analysis results"""
-    results_file = '../exit_analysis_history.json'
-    
-    if not os.path.exists(results_file):
+    if not os.path.exists(RESULTS_FILE):
         print("❌ No analysis history found. Run analyze_exits.py first.")
-        print("💡 Make sure you're running from the test folder and exit_analysis_history.json exists in ../")
+        print("💡 Make sure you're running from the test folder and exit_analysis_history.jsonl exists in ../")
         return
     
-    with open(results_file, 'r') as f:
-        history = json.load(f)
+    history = load_history()
     
     print("📊 EXIT ANALYSIS HISTORY")
     print("=" * 80)
@@ -42,31 +54,36 @@ def view_analysis_history():
         print("📈 PERFORMANCE TRENDS")
         print("=" * 80)
         
-        pnls = [h['overall_performance'].get('total_pnl', 0) for h in history]
-        trades = [h['overall_performance'].get('total_trades', 0) for h in history]
-        dates = [h['analysis_date'] for h in history]
+        # One pass builds both progressions, tracking the previous run for deltas
+        pnl_lines = []
+        trade_lines = []
+        prev_pnl = prev_trades = None
+        for h in history:
+            overall = h['overall_performance']
+            pnl = overall.get('total_pnl', 0)
+            trade_count = overall.get('total_trades', 0)
+            date = h['analysis_date']
+            
+            if prev_pnl is None:
+                pnl_change_str = trade_change_str = "(baseline)"
+            else:
+                change = pnl - prev_pnl
+                pnl_change_str = f"({change:+.4f})" if change != 0 else "(no change)"
+                change = trade_count - prev_trades
+                trade_change_str = f"(+{change})" if change > 0 else f"({change})"
+            pnl_lines.append(f"   {date}: {pnl:+.4f} SOL {pnl_change_str}")
+            trade_lines.append(f"   {date}: {trade_count} trades {trade_change_str}")
+            prev_pnl, prev_trades = pnl, trade_count
         
         print(f"📊 PnL Progression:")
-        for i, (date, pnl) in enumerate(zip(dates, pnls)):
-            if i > 0:
-                change = pnl - pnls[i-1]
-                change_str = f"({change:+.4f})" if change != 0 else "(no change)"
-            else:
-                change_str = "(baseline)"
-            print(f"   {date}: {pnl:+.4f} SOL {change_str}")
+        print("\n".join(pnl_lines))
         
         print(f"\n📈 Trade Count Progression:")
-        for i, (date, trade_count) in enumerate(zip(dates, trades)):
-            if i > 0:
-                change = trade_count - trades[i-1]
-                change_str = f"(+{change})" if change > 0 else f"({change})"
-            else:
-                change_str = "(baseline)"
-            print(f"   {date}: {trade_count} trades {change_str}")
+        print("\n".join(trade_lines))
         
         # Calculate overall improvement
-        first_pnl = pnls[0]
-        last_pnl = pnls[-1]
+        first_pnl = history[0]['overall_performance'].get('total_pnl', 0)
+        last_pnl = prev_pnl
         total_improvement = last_pnl - first_pnl
         
         print(f"\n🎯 OVERALL PERFORMANCE SUMMARY:")
@@ -83,15 +100,12 @@ def view_analysis_history():
 
 def compare_exit_types():
     """Compare exit type performance across runs"""
-    results_file = '../exit_analysis_history.json'
-    
-    if not os.path.exists(results_file):
+    if not os.path.exists(RESULTS_FILE):
         print("❌ No analysis history found.")
-        print("💡 Make sure you're running from the test folder and exit_analysis_history.json exists in ../")
+        print("💡 Make sure you're running from the test folder and exit_analysis_history.jsonl exists in ../")
         return
     
-    with open(results_file, 'r') as f:
-        history = json.load(f)
+    history = load_history()
     
     if len(history) < 2:
         print("❌ Need at least 2 analysis runs to compare.")
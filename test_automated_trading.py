@@ -6,20 +6,40 @@ This script simulates a pool ready event to test the trading mechanism
 
 import asyncio
 import json
+import sys
 import socketio
 from datetime import datetime
 from colorama import init, Fore, Style
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize colorama
 init()
 
+# Terminal colors, emitted only when stdout is a TTY
+_USE_COLOR = sys.stdout.isatty()
+RED = Fore.RED if _USE_COLOR else ''
+GREEN = Fore.GREEN if _USE_COLOR else ''
+YELLOW = Fore.YELLOW if _USE_COLOR else ''
+CYAN = Fore.CYAN if _USE_COLOR else ''
+RESET = Style.RESET_ALL if _USE_COLOR else ''
+
+def _dumps_event(data) -> str:
+    """Compact JSON for printing an event"""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(',', ':'))
+
 # Create Socket.IO client for testing
 sio = socketio.AsyncClient()
 
 @sio.event
 async def connect():
     """Handle connection"""
-    print(f"{Fore.GREEN}✅ Connected to test server{Style.RESET_ALL}")
+    print(f"{GREEN}✅ Connected to test server{RESET}")
     
     # Simulate a pool ready event
     test_event = {
@@ -32,12 +52,12 @@ async def connect():
         }
     }
     
-    print(f"{Fore.CYAN}🧪 Simulating pool ready event...{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}Event: {json.dumps(test_event, indent=2)}{Style.RESET_ALL}")
+    print(f"{CYAN}🧪 Simulating pool ready event...{RESET}")
+    print(f"{CYAN}Event: {_dumps_event(test_event)}{RESET}")
     
     # Emit the test event
     await sio.emit('pool_ready', test_event)
-    print(f"{Fore.GREEN}✅ Test event sent!{Style.RESET_ALL}")
+    print(f"{GREEN}✅ Test event sent!{RESET}")
     
     # Disconnect after sending
     await asyncio.sleep(2)
@@ -46,18 +66,18 @@ async def connect():
 @sio.event
 async def disconnect():
     """Handle disconnection"""
-    print(f"{Fore.YELLOW}Test completed{Style.RESET_ALL}")
+    print(f"{YELLOW}Test completed{RESET}")
 
 async def main():
     """Main test function"""
-    print(f"{Fore.CYAN}🧪 Testing Automated Trading System{Style.RESET_ALL}")
-    print(f"{Fore.CYAN}This will simulate a pool ready event{Style.RESET_ALL}")
+    print(f"{CYAN}🧪 Testing Automated Trading System{RESET}")
+    print(f"{CYAN}This will simulate a pool ready event{RESET}")
     
     try:
         await sio.connect('http://localhost:5001')
         await asyncio.sleep(3)  # Wait for event to be processed
     except Exception as e:
-        print(f"{Fore.RED}Test failed: {e}{Style.RESET_ALL}")
+        print(f"{RED}Test failed: {e}{RESET}")
     finally:
         if sio.connected:
             await sio.disconnect()
@@ -19,13 +19,19 @@ sio = socketio.AsyncClient(
     engineio_logger=False,
 )
 
-# Global flags
-running = True
+# Set by _request_shutdown (signals) or on disconnect; main() waits on it
+stop_event = None
 shutdown_requested = False
+force_shutdown_handle = None
 
-def signal_handler(sig, frame):
-    """Handle graceful shutdown on SIGINT (Ctrl+C)"""
-    global running, shutdown_requested
+def force_shutdown():
+    """Exit if graceful shutdown has not finished in time"""
+    print(f"\n{Fore.RED}Force shutdown after timeout{Style.RESET_ALL}")
+    sys.exit(1)
+
+def _request_shutdown():
+    """Handle graceful shutdown on SIGINT (Ctrl+C) / SIGTERM; runs on the event loop"""
+    global shutdown_requested, force_shutdown_handle
     
     if shutdown_requested:
         print(f"\n{Fore.RED}Force shutting down...{Style.RESET_ALL}")
@@ -35,33 +41,12 @@ def signal_handler(sig, frame):
     print(f"\n{Fore.YELLOW}🛑 Shutdown requested (Ctrl+C)...{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}⏳ Disconnecting from server and cleaning up...{Style.RESET_ALL}")
     
-    running = False
-    
-    # Schedule force shutdown after 3 seconds
-    def force_shutdown():
-        print(f"\n{Fore.RED}Force shutdown after timeout{Style.RESET_ALL}")
-        sys.exit(1)
-    
-    import threading
-    timer = threading.Timer(3.0, force_shutdown)
-    timer.start()
-    
-    # Try to disconnect gracefully
-    try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            asyncio.create_task(graceful_shutdown())
-        else:
-            asyncio.run(graceful_shutdown())
-    except Exception as e:
-        print(f"{Fore.RED}Error during graceful shutdown: {e}{Style.RESET_ALL}")
-        timer.cancel()
-        sys.exit(1)
+    # Force shutdown after 3 seconds if the disconnect hangs
+    force_shutdown_handle = asyncio.get_running_loop().call_later(3.0, force_shutdown)
+    stop_event.set()
 
 async def graceful_shutdown():
     """Perform graceful shutdown operations"""
-    global sio
-    
     try:
         if sio.connected:
             print(f"{Fore.CYAN}🔌 Disconnecting from Socket.IO server...{Style.RESET_ALL}")
@@ -72,12 +57,9 @@ async def graceful_shutdown():
     except Exception as e:
         print(f"{Fore.RED}❌ Error disconnecting: {e}{Style.RESET_ALL}")
     
+    if force_shutdown_handle:
+        force_shutdown_handle.cancel()
     print(f"{Fore.GREEN}✅ Shutdown complete{Style.RESET_ALL}")
-    sys.exit(0)
-
-# Register signal handlers
-signal.signal(signal.SIGINT, signal_handler)
-signal.signal(signal.SIGTERM, signal_handler)
 
 @sio.event
 async def connect():
@@ -89,10 +71,16 @@ async def connect():
 async def disconnect():
     """Handle disconnection"""
     print(f"{Fore.YELLOW}⚠️  Disconnected from server{Style.RESET_ALL}")
+    stop_event.set()
 
 async def main():
     """Main function"""
-    global running
+    global stop_event
+    
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, _request_shutdown)
     
     print(f"{Fore.CYAN}Starting Ctrl+C test...{Style.RESET_ALL}")
     print(f"{Fore.CYAN}Connecting to localhost:5001...{Style.RESET_ALL}")
@@ -100,9 +88,10 @@ async def main():
     try:
         await sio.connect('http://localhost:5001')
         
-        # Keep connection alive
-        while running and sio.connected:
-            await asyncio.sleep(1)
+        # Keep connection alive until a signal arrives or the server disconnects
+        await stop_event.wait()
+        if shutdown_requested:
+            await graceful_shutdown()
             
     except Exception as e:
         print(f"{Fore.RED}Connection failed: {e}{Style.RESET_ALL}")
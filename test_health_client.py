@@ -1,6 +1,5 @@
 import asyncio
 import socketio
-from datetime import datetime
 
 # Create a Socket.IO client
 sio = socketio.AsyncClient()
@@ -17,11 +16,12 @@ async def disconnect():
 @sio.on('health')
 async def on_health(data):
     """Handle health check events"""
-    try:
-        timestamp = datetime.fromisoformat(data.get('timestamp', '').replace('Z', '+00:00'))
-        formatted_time = timestamp.strftime('%H:%M:%S')
-    except Exception:
-        formatted_time = data.get('timestamp', 'Invalid timestamp')
+    # ISO-8601 'YYYY-MM-DDTHH:MM:SS...'; only the clock part is shown
+    timestamp = data.get('timestamp', 'Invalid timestamp')
+    if isinstance(timestamp, str) and len(timestamp) >= 19 and timestamp[10:11] == 'T':
+        formatted_time = timestamp[11:19]
+    else:
+        formatted_time = timestamp
 
     uptime = data.get('uptime', 0)
     hours = int(uptime) // 3600
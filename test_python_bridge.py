@@ -8,53 +8,61 @@ import aiohttp
 import json
 from datetime import datetime
 
-async def test_api_endpoints():
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+BASE_URL = 'http://localhost:5001'
+
+async def _probe(session, path):
+    """GET one endpoint; returns (status, parsed JSON or None)"""
+    async with session.get(f'{BASE_URL}{path}') as response:
+        if response.status != 200:
+            return response.status, None
+        return response.status, await response.json()
+
+async def test_api_endpoints(session):
     """Test all API endpoints to ensure they're working"""
-    base_url = 'http://localhost:5001'
-    
     print("🔍 Testing API Endpoints...")
     print("=" * 60)
     
+    # Probe all endpoints concurrently over the shared session, then report in order
+    health, status, portfolio = await asyncio.gather(
+        _probe(session, '/health'),
+        _probe(session, '/trading/status'),
+        _probe(session, '/trading/paper-portfolio'),
+        return_exceptions=True
+    )
+    
     # Test health endpoint
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'{base_url}/health') as response:
-                if response.status == 200:
-                    data = await response.json()
-                    print(f"✅ Health Check: {data.get('status', 'unknown')}")
-                else:
-                    print(f"❌ Health Check: HTTP {response.status}")
-    except Exception as e:
-        print(f"❌ Health Check Error: {e}")
+    if isinstance(health, Exception):
+        print(f"❌ Health Check Error: {health}")
+    elif health[1] is None:
+        print(f"❌ Health Check: HTTP {health[0]}")
+    else:
+        print(f"✅ Health Check: {health[1].get('status', 'unknown')}")
     
     # Test trading status
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'{base_url}/trading/status') as response:
-                if response.status == 200:
-                    data = await response.json()
-                    early_trading = data.get('data', {}).get('earlyTrading', {})
-                    print(f"✅ Trading Status: {early_trading.get('status', 'unknown')}")
-                    print(f"   📊 Active Positions: {early_trading.get('stats', {}).get('activePositions', 0)}")
-                else:
-                    print(f"❌ Trading Status: HTTP {response.status}")
-    except Exception as e:
-        print(f"❌ Trading Status Error: {e}")
+    if isinstance(status, Exception):
+        print(f"❌ Trading Status Error: {status}")
+    elif status[1] is None:
+        print(f"❌ Trading Status: HTTP {status[0]}")
+    else:
+        early_trading = status[1].get('data', {}).get('earlyTrading', {})
+        print(f"✅ Trading Status: {early_trading.get('status', 'unknown')}")
+        print(f"   📊 Active Positions: {early_trading.get('stats', {}).get('activePositions', 0)}")
     
     # Test paper portfolio
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f'{base_url}/trading/paper-portfolio') as response:
-                if response.status == 200:
-                    data = await response.json()
-                    portfolio = data.get('data', {})
-                    print(f"✅ Paper Portfolio: {portfolio.get('balance', 0)} SOL")
-                    print(f"   📈 Total PnL: {portfolio.get('totalPnL', 0)} SOL")
-                    print(f"   🎯 Total Trades: {portfolio.get('totalTrades', 0)}")
-                else:
-                    print(f"❌ Paper Portfolio: HTTP {response.status}")
-    except Exception as e:
-        print(f"❌ Paper Portfolio Error: {e}")
+    if isinstance(portfolio, Exception):
+        print(f"❌ Paper Portfolio Error: {portfolio}")
+    elif portfolio[1] is None:
+        print(f"❌ Paper Portfolio: HTTP {portfolio[0]}")
+    else:
+        data = portfolio[1].get('data', {})
+        print(f"✅ Paper Portfolio: {data.get('balance', 0)} SOL")
+        print(f"   📈 Total PnL: {data.get('totalPnL', 0)} SOL")
+        print(f"   🎯 Total Trades: {data.get('totalTrades', 0)}")
     
     print("=" * 60)
 
@@ -80,7 +88,7 @@ async def test_websocket_connection():
         print(f"✅ Health Event Received: {data.get('uptime', 0)}s uptime")
     
     try:
-        await sio.connect('http://localhost:5001')
+        await sio.connect(BASE_URL)
         print("✅ WebSocket connection successful")
         
         # Wait for a health event
@@ -100,11 +108,17 @@ async def main():
     print("🚀 Python Bridge Test Suite")
     print("=" * 60)
     
-    await test_api_endpoints()
+    # One keep-alive connector so the probes reuse pooled sockets
+    connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=5)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await test_api_endpoints(session)
     await test_websocket_connection()
     
     print("\n🎉 Test Suite Complete!")
     print("=" * 60)
 
 if __name__ == '__main__':
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main()) 
\ No newline at end of file
@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 
 import asyncio
+import os
 import socketio
 import json
 from datetime import datetime
 
 # Create a Socket.IO client
+# Per-packet client logging only with SIO_DEBUG=1
+SIO_DEBUG = os.getenv('SIO_DEBUG') == '1'
 sio = socketio.AsyncClient(
-    logger=True,
-    engineio_logger=True
+    logger=SIO_DEBUG,
+    engineio_logger=SIO_DEBUG
 )
 
 @sio.event
@@ -6,6 +6,11 @@ from datetime import datetime
 import socketio
 from colorama import init, Fore, Style
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Constants
 SERVER_URL = 'http://localhost:5001'
 RECONNECT_DELAY = 5  # seconds
@@ -369,6 +374,8 @@ async def main():
         print(f"{Fore.GREEN}Listener stopped{Style.RESET_ALL}")
 
 if __name__ == '__main__':
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
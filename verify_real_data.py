@@ -3,12 +3,29 @@
 Comprehensive verification script to confirm we're getting real-world Raydium data
 """
 
+import os
 import sqlite3
 import json
 import requests
 from datetime import datetime
 import time
 
+LOG_FILE = 'logs/nestjs.log'
+TAIL_BLOCK_SIZE = 1 << 20  # read the log backwards in 1 MB blocks
+
+def _tail_lines(path, count):
+    """Return the last `count` lines of a log without reading or decoding the rest of it"""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b''
+        # One extra newline guarantees the first kept line is complete
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return [line.decode('utf-8', errors='replace') for line in data.splitlines(keepends=True)[-count:]]
+
 def analyze_price_movements():
     """Analyze price movements to verify they're realistic"""
     print("🔍 ANALYZING PRICE MOVEMENTS")
@@ -150,9 +167,7 @@ def analyze_message_volume():
     
     # Check recent logs for message volume
     try:
-        with open('logs/nestjs.log', 'r') as f:
-            lines = f.readlines()
-            recent_lines = lines[-100:]  # Last 100 lines
+        recent_lines = _tail_lines(LOG_FILE, 100)  # Last 100 lines
         
         raydium_messages = []
         status_6_events = []
@@ -195,7 +210,6 @@ def check_websocket_connection():
     print("=" * 60)
     
     # Check environment variables
-    import os
     wss_url = os.getenv('WSS_URL', 'wss://api.mainnet-beta.solana.com')
     http_url = os.getenv('HTTP_URL', 'https://api.mainnet-beta.solana.com')
     
@@ -211,9 +225,7 @@ def check_websocket_connection():
     
     # Check if system is currently receiving data
     try:
-        with open('logs/nestjs.log', 'r') as f:
-            lines = f.readlines()
-            recent_lines = lines[-20:]
+        recent_lines = _tail_lines(LOG_FILE, 20)
         
         active_connections = [line for line in recent_lines if 'Status 6 listener received event' in line]
         